@@ -58,7 +58,11 @@ const summarizeText = async () => {
       throw new Error(errorMsg);
     }
     const data = await response.json();
+    if (data.tier?.tier === "fast") {
+      console.info("Summarized with the fast model tier (server under load)");
+    }
     textSummary.value = data.summary || "No important content detected.";
+    summaryNotes.text = data.chunks || [];
     textSummary.classList.remove("placeholder");
     showToast("Text summarized successfully!");
   } catch (error) {
@@ -72,6 +76,117 @@ const summarizeText = async () => {
   }
 };
 
+// Files above this size use the resumable chunked upload protocol.
+const CHUNKED_UPLOAD_THRESHOLD = 32 * 1024 * 1024;
+const PARALLEL_PARTS = 4;
+const PART_RETRIES = 3;
+const COMPLETE_RETRIES = 3;
+
+const readErrorDetail = async (response, fallback) => {
+  try {
+    const errorData = await response.json();
+    if (errorData?.detail?.message) return errorData.detail.message;
+    if (errorData?.detail) return errorData.detail;
+  } catch {
+    // Ignore JSON parse errors
+  }
+  return fallback;
+};
+
+const sha256Hex = async (buffer) => {
+  const digest = await crypto.subtle.digest("SHA-256", buffer);
+  return Array.from(new Uint8Array(digest))
+    .map((b) => b.toString(16).padStart(2, "0"))
+    .join("");
+};
+
+const uploadKey = (file) => `summarizer:upload:${file.name}:${file.size}:${file.lastModified}`;
+
+// Reuse a previous session for the same file when the server still has it,
+// so a dropped connection only re-sends the missing parts.
+const startOrResumeUpload = async (file) => {
+  const savedId = localStorage.getItem(uploadKey(file));
+  if (savedId) {
+    const response = await fetch(`${loadApiBase()}/uploads/${savedId}`);
+    if (response.ok) {
+      const status = await response.json();
+      return { uploadId: savedId, partSize: status.part_size, done: new Set(status.parts) };
+    }
+    localStorage.removeItem(uploadKey(file));
+  }
+
+  const response = await fetch(`${loadApiBase()}/uploads`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ filename: file.name, size: file.size }),
+  });
+  if (!response.ok) {
+    throw new Error(await readErrorDetail(response, "Failed to start upload"));
+  }
+  const session = await response.json();
+  localStorage.setItem(uploadKey(file), session.upload_id);
+  return { uploadId: session.upload_id, partSize: session.part_size, done: new Set() };
+};
+
+const uploadPart = async (uploadId, file, offset, partSize) => {
+  const buffer = await file.slice(offset, offset + partSize).arrayBuffer();
+  const checksum = await sha256Hex(buffer);
+  let lastError;
+  for (let attempt = 0; attempt < PART_RETRIES; attempt += 1) {
+    try {
+      const response = await fetch(`${loadApiBase()}/uploads/${uploadId}/parts?offset=${offset}`, {
+        method: "PUT",
+        headers: { "Content-Type": "application/octet-stream", "X-Part-SHA256": checksum },
+        body: buffer,
+      });
+      if (response.ok) return;
+      lastError = new Error(await readErrorDetail(response, "Failed to upload part"));
+    } catch (error) {
+      lastError = error;
+    }
+  }
+  throw lastError;
+};
+
+const chunkedUpload = async (file) => {
+  const { uploadId, partSize, done } = await startOrResumeUpload(file);
+  const offsets = [];
+  for (let offset = 0; offset < file.size; offset += partSize) {
+    if (!done.has(offset)) offsets.push(offset);
+  }
+
+  const total = Math.ceil(file.size / partSize);
+  let finished = total - offsets.length;
+  const worker = async () => {
+    while (offsets.length) {
+      const offset = offsets.shift();
+      await uploadPart(uploadId, file, offset, partSize);
+      finished += 1;
+      mediaButton.textContent = `Uploading ${Math.round((finished / total) * 100)}%`;
+    }
+  };
+  await Promise.all(Array.from({ length: PARALLEL_PARTS }, worker));
+
+  mediaButton.textContent = "Processing...";
+  return uploadId;
+};
+
+// A 503 ("busy, retry later") keeps the assembled upload on the server, so
+// only the /complete call is repeated.
+const completeUpload = async (uploadId, signal) => {
+  for (let attempt = 0; ; attempt += 1) {
+    const response = await fetch(`${loadApiBase()}/uploads/${uploadId}/complete`, {
+      method: "POST",
+      signal,
+    });
+    if (response.status !== 503 || attempt >= COMPLETE_RETRIES) return response;
+    const wait = Math.min(Number(response.headers.get("Retry-After")) || 30, 120);
+    mediaButton.textContent = `Server busy, retrying in ${wait}s...`;
+    await new Promise((resolve) => setTimeout(resolve, wait * 1000));
+    mediaButton.textContent = "Processing...";
+  }
+};
+
 const processMedia = async () => {
   const file = mediaInput.files?.[0];
   if (!file) {
@@ -85,35 +200,47 @@ const processMedia = async () => {
   mediaSummary.value = "";
 
   try {
-    const formData = new FormData();
-    formData.append("file", file);
-    
+    // Large files are uploaded in resumable parts first; the processing
+    // timeout below only starts once the upload itself has finished.
+    const uploadId = file.size > CHUNKED_UPLOAD_THRESHOLD && window.crypto?.subtle
+      ? await chunkedUpload(file)
+      : null;
+
     // Create AbortController for timeout
     const controller = new AbortController();
     const timeoutId = setTimeout(() => controller.abort(), 300000); // 5 minute timeout
     
-    const response = await fetch(`${loadApiBase()}/transcribe-and-summarize`, {
-      method: "POST",
-      body: formData,
-      signal: controller.signal,
-    });
+    let response;
+    if (uploadId) {
+      response = await completeUpload(uploadId, controller.signal);
+      // Keep the id after a 503 so a later attempt resumes the same upload.
+      if (response.status !== 503) localStorage.removeItem(uploadKey(file));
+    } else {
+      const formData = new FormData();
+      formData.append("file", file);
+      response = await fetch(`${loadApiBase()}/transcribe-and-summarize`, {
+        method: "POST",
+        body: formData,
+        signal: controller.signal,
+      });
+    }
     
     clearTimeout(timeoutId);
     if (!response.ok) {
-      let errorMsg = "Failed to process media file";
-      try {
-        const errorData = await response.json();
-        if (errorData?.detail) {
-          errorMsg = errorData.detail;
-        }
-      } catch {
-        // Ignore JSON parse errors
-      }
+      const errorMsg = await readErrorDetail(response, "Failed to process media file");
       throw { message: errorMsg, response };
     }
     const data = await response.json();
+    if (data.admission) {
+      const { duration_seconds: duration, queued_seconds: queued } = data.admission;
+      console.info(`Processed ${Math.round(duration / 60)} min of audio (queued ${queued}s)`);
+    }
+    if (data.tier?.tier === "fast") {
+      console.info("Processed with the fast model tier (server under load)");
+    }
     mediaTranscript.value = data.transcript || "";
     mediaSummary.value = data.summary || "";
+    summaryNotes.media = data.chunks || [];
     if (!data.transcript) {
       showToast("Warning: No transcript generated. Check if ffmpeg is installed.");
     } else {
@@ -136,7 +263,10 @@ const processMedia = async () => {
   }
 };
 
-const downloadPDF = async (filename, text) => {
+// Per-section notes from the last summary, rendered under the summary in the PDF.
+const summaryNotes = { text: [], media: [] };
+
+const downloadPDF = async (filename, text, chunks = []) => {
   // 1. Validation
   if (!text || text.trim() === "" || text.includes("No summary generated yet")) {
     showToast("There is no summary to download.");
@@ -155,6 +285,7 @@ const downloadPDF = async (filename, text) => {
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ 
         text: text, 
+        chunks: chunks,
         filename: filename.replace(".txt", ".pdf") // Ensure extension is pdf
       }),
     });
@@ -192,9 +323,9 @@ mediaButton.addEventListener("click", processMedia);
 textDownloadBtn.addEventListener("click", () => {
     // If the class is placeholder, treat it as empty
     const content = textSummary.classList.contains("placeholder") ? "" : textSummary.value;
-    downloadPDF("lecture_summary.pdf", content);
+    downloadPDF("lecture_summary.pdf", content, content ? summaryNotes.text : []);
 });
 
 mediaDownloadBtn.addEventListener("click", () => {
-    downloadPDF("media_summary.pdf", mediaSummary.value);
+    downloadPDF("media_summary.pdf", mediaSummary.value, summaryNotes.media);
 });
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""
+Find the best thread / worker / batch-size settings for this node.
+
+Runs short calibrated workloads through the summarizer and transcriber for
+each candidate configuration (worker processes x torch threads per worker x
+batch size per model), skips configurations whose combined memory footprint
+exceeds the cap, and writes the winner to the node profile that
+backend/config.py loads at startup. The winner's pool settings are for
+batch_process.py; the server, a single process, gets the threads of the
+best single-worker configuration.
+
+Every workload (one model at one batch size) runs on a fresh worker pool
+that loads only that model, and its memory is the growth of each worker's
+peak RSS over the worker's baseline (interpreter + libraries). A
+configuration's footprint is workers x (baseline + both models' growth),
+since a server or batch worker holds both models at once. With a memory cap,
+a single-worker run comes first and pools projected to exceed the cap are
+skipped without being started.
+
+Usage:
+    python autotune.py [--objective throughput|latency] [--memory-cap-gb N] [--quick]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+SAMPLE_SENTENCE = (
+    "In this lecture we look at how a neural network learns its weights by "
+    "following the gradient of the loss function one small step at a time. "
+)
+
+
+# ---------------------------------------------------------------- worker side
+
+# Peak RSS of this worker before any model was loaded.
+_baseline_bytes = 0
+
+
+def _init_worker(intra_op, inter_op, model):
+    global _baseline_bytes
+    from backend.services.runtime import apply_thread_settings
+
+    apply_thread_settings(intra_op=intra_op, inter_op=inter_op)
+
+    from backend.services import summarizer, transcriber  # noqa: F401  (registers loaders)
+    from backend.services.model_registry import registry
+
+    _baseline_bytes = _peak_memory_bytes()
+    registry.get(REGISTRY_NAMES[model])
+
+
+def _peak_memory_bytes():
+    try:
+        import resource
+    except ImportError:
+        # No getrusage (Windows): fall back to the resident model size.
+        from backend.services.model_registry import registry
+
+        return registry.stats()["loaded_bytes"]
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _sample(started):
+    """(seconds, pid, baseline bytes, growth over the baseline) for one call."""
+    return time.perf_counter() - started, os.getpid(), _baseline_bytes, _peak_memory_bytes() - _baseline_bytes
+
+
+def _summarizer_call(batch_size, words):
+    from backend.services import summarizer
+
+    text = " ".join((SAMPLE_SENTENCE * (words // 20 + 1)).split()[:words])
+    started = time.perf_counter()
+    summarizer._summarize_batch([text] * batch_size)
+    return _sample(started)
+
+
+def _transcriber_call(batch_size, _words):
+    import numpy as np
+
+    from backend.config import AUDIO_CHUNK_SIZE, TARGET_SAMPLE_RATE
+    from backend.services import transcriber
+
+    rng = np.random.default_rng(0)
+    t = np.arange(AUDIO_CHUNK_SIZE) / TARGET_SAMPLE_RATE
+    window = (0.1 * np.sin(2 * np.pi * 220 * t) + 0.01 * rng.standard_normal(len(t))).astype("float32")
+    started = time.perf_counter()
+    transcriber._transcribe_batch([window] * batch_size, TARGET_SAMPLE_RATE)
+    return _sample(started)
+
+
+WORKLOADS = {"summarizer": _summarizer_call, "transcriber": _transcriber_call}
+REGISTRY_NAMES = {"summarizer": "summarizer", "transcriber": "whisper"}
+
+
+# ---------------------------------------------------------------- parent side
+
+def measure(workers, intra_op, inter_op, batch_sizes, items, words):
+    """
+    Run each workload on its own fresh pool; ``batch_sizes`` maps each model
+    to the batch sizes to try. Returns metrics per model and batch size.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for model, sizes in batch_sizes.items():
+        call = WORKLOADS[model]
+        results[model] = {}
+        for batch_size in sizes:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=context,
+                initializer=_init_worker, initargs=(intra_op, inter_op, model),
+            ) as pool:
+                calls = max(workers, math.ceil(items / batch_size))
+                # Warm-up: one call per worker so loading/first-call cost is excluded.
+                list(pool.map(call, [batch_size] * workers, [words] * workers))
+
+                started = time.perf_counter()
+                samples = list(pool.map(call, [batch_size] * calls, [words] * calls))
+                wall = time.perf_counter() - started
+
+            latencies = sorted(s[0] for s in samples)
+            results[model][batch_size] = {
+                "throughput": calls * batch_size / wall,
+                "latency": latencies[len(latencies) // 2],
+                # Per worker: the largest baseline and growth seen.
+                "baseline_bytes": max(s[2] for s in samples),
+                "memory_bytes": max(s[3] for s in samples),
+            }
+    return results
+
+
+def score(metrics, objective):
+    return metrics["throughput"] if objective == "throughput" else -metrics["latency"]
+
+
+def footprint(workers, metrics):
+    """Memory of ``workers`` processes each holding every measured model."""
+    baseline = max(m["baseline_bytes"] for m in metrics.values())
+    return workers * (baseline + sum(m["memory_bytes"] for m in metrics.values()))
+
+
+def fitting_batches(probe, memory_cap, workers):
+    """
+    Batch sizes per model that ``workers`` processes could run under the
+    memory cap, projected from single-worker ``probe`` results, so pools that
+    would not fit are never spawned.
+    """
+    smallest = {m: results[min(results)] for m, results in probe.items()}
+    return {
+        model: tuple(
+            b for b in sorted(results)
+            if footprint(workers, {**smallest, model: results[b]}) <= memory_cap
+        )
+        for model, results in probe.items()
+    }
+
+
+def choose_batches(results, objective, memory_cap, workers):
+    """
+    Best batch size per model such that all models together fit the memory
+    cap, as {model: (batch, metrics)}, or None if nothing fits.
+    """
+    models = list(results)
+    best, best_score = None, None
+    for batches in itertools.product(*(sorted(results[m]) for m in models)):
+        metrics = {m: results[m][b] for m, b in zip(models, batches)}
+        if memory_cap and footprint(workers, metrics) > memory_cap:
+            continue
+        # Both models must be good on the same pool: combine per-model
+        # throughputs geometrically (latencies for the latency objective).
+        if objective == "throughput":
+            combined = math.prod(m["throughput"] for m in metrics.values())
+        else:
+            combined = -math.prod(m["latency"] for m in metrics.values())
+        if best_score is None or combined > best_score:
+            best = {m: (b, metrics[m]) for m, b in zip(models, batches)}
+            best_score = combined
+    return best, best_score
+
+
+def candidate_pools(cpu_count, objective):
+    powers = [n for n in (1, 2, 4, 8, 16, 32, 64, 128) if n <= cpu_count]
+    if cpu_count not in powers:
+        powers.append(cpu_count)
+    # A single request never runs on more than one worker, so latency tuning
+    # only varies the threads of one worker.
+    worker_options = [1] if objective == "latency" else powers
+    return [(w, t) for w in worker_options for t in powers if w * t <= cpu_count]
+
+
+def main():
+    from backend.config import NODE_PROFILE_PATH
+
+    parser = argparse.ArgumentParser(description="Autotune thread, worker and batch settings.")
+    parser.add_argument("--objective", choices=("throughput", "latency"), default="throughput")
+    parser.add_argument("--memory-cap-gb", type=float, default=0,
+                        help="Skip configurations whose combined memory footprint exceeds this (0 = no cap)")
+    parser.add_argument("--items", type=int, default=8, help="Chunks/windows per measurement")
+    parser.add_argument("--words", type=int, default=400, help="Words per calibration text chunk")
+    parser.add_argument("--quick", action="store_true", help="Fewer candidate batch sizes")
+    parser.add_argument("--output", type=Path, default=NODE_PROFILE_PATH)
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    memory_cap = args.memory_cap_gb * 1024 ** 3
+    batch_sizes = (1, 2) if args.quick else (1, 2, 4)
+    pools = candidate_pools(cpu_count, args.objective)
+
+    print(f"Autotuning for {args.objective} on {cpu_count} CPUs: {len(pools)} pool configurations")
+    print("-" * 50)
+
+    all_batches = {model: batch_sizes for model in WORKLOADS}
+    probe = None
+    if memory_cap:
+        # Per-worker memory hardly depends on the pool, so one single-worker
+        # run projects every pool's footprint before any of them is spawned.
+        probe = measure(1, 1, 0, all_batches, args.items, args.words)
+
+    best = None
+    tried = []
+    for workers, threads in pools:
+        batches = all_batches
+        if probe is not None:
+            batches = fitting_batches(probe, memory_cap, workers)
+            if not all(batches.values()):
+                print(f"[SKIP] workers={workers} threads={threads}: projected to exceed memory cap")
+                continue
+        try:
+            if probe is not None and (workers, threads) == (1, 1):
+                results = probe
+            else:
+                results = measure(workers, threads, 0, batches, args.items, args.words)
+        except Exception as e:
+            print(f"[ERROR] workers={workers} threads={threads}: {e}")
+            continue
+
+        choice, combined = choose_batches(results, args.objective, memory_cap, workers)
+        if choice is None:
+            print(f"[SKIP] workers={workers} threads={threads}: exceeds memory cap")
+            continue
+
+        entry = {
+            "batch_worker_count": workers,
+            "batch_intra_op_threads": threads,
+            "summary_batch_size": choice["summarizer"][0],
+            "transcribe_batch_size": choice["transcriber"][0],
+            "score": combined,
+            "memory_bytes": footprint(workers, {model: m for model, (_, m) in choice.items()}),
+            "metrics": {model: m for model, (_, m) in choice.items()},
+        }
+        tried.append(entry)
+        print(
+            f"[OK] workers={workers} threads={threads} "
+            f"summarizer b={entry['summary_batch_size']} "
+            f"{choice['summarizer'][1]['throughput']:.2f}/s "
+            f"{choice['summarizer'][1]['latency']:.2f}s | "
+            f"transcriber b={entry['transcribe_batch_size']} "
+            f"{choice['transcriber'][1]['throughput']:.2f}/s "
+            f"{choice['transcriber'][1]['latency']:.2f}s | "
+            f"{entry['memory_bytes'] / 1024 ** 3:.1f} GB"
+        )
+        if best is None or combined > best["score"]:
+            best = entry
+
+    if best is None:
+        print("[ERROR] No configuration fit the memory cap.")
+        return 1
+
+    # The server is a single process: give it the threads of the best
+    # single-worker pool rather than the per-worker share of a batch pool.
+    single = [entry for entry in tried if entry["batch_worker_count"] == 1]
+    server_threads = (
+        max(single, key=lambda entry: entry["score"])["batch_intra_op_threads"]
+        if single
+        else min(cpu_count, best["batch_intra_op_threads"] * best["batch_worker_count"])
+    )
+
+    # Inter-op threads matter far less; refine them on the winner only,
+    # using the summarizer (the dominant cost) as the yardstick.
+    inter_op = 0
+    baseline = best["metrics"]["summarizer"]
+    for candidate in (1, 2):
+        metrics = measure(
+            best["batch_worker_count"], best["batch_intra_op_threads"], candidate,
+            {"summarizer": (best["summary_batch_size"],)}, args.items, args.words,
+        )["summarizer"][best["summary_batch_size"]]
+        if score(metrics, args.objective) > score(baseline, args.objective):
+            inter_op, baseline = candidate, metrics
+
+    profile = {
+        "host": platform.node(),
+        "cpu_count": cpu_count,
+        "objective": args.objective,
+        "memory_cap_bytes": int(memory_cap),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "settings": {
+            "torch_intra_op_threads": server_threads,
+            "torch_inter_op_threads": inter_op,
+            "batch_worker_count": best["batch_worker_count"],
+            "batch_intra_op_threads": best["batch_intra_op_threads"],
+            "summary_batch_size": best["summary_batch_size"],
+            "transcribe_batch_size": best["transcribe_batch_size"],
+        },
+        "candidates": tried,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+
+    print("-" * 50)
+    print(f"[OK] Best settings: {profile['settings']}")
+    print(f"Profile written to {args.output}; the server loads it at startup.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
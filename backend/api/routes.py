@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+import shutil
+import sqlite3
 import tempfile
+import time
 from pathlib import Path
+from typing import Callable, Optional
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, Header, HTTPException, Query, Request, UploadFile
 from pydantic import BaseModel, constr
+from starlette.concurrency import run_in_threadpool
 
-from backend.services import summarizer, transcriber,utilities
+from backend.config import UPLOAD_PART_SIZE
+from backend.services import (
+    admission,
+    degrade,
+    pdf_renderer,
+    scheduler,
+    search_index,
+    summarizer,
+    tiers,
+    transcriber,
+    uploads,
+    utilities,
+)
+from backend.services.model_registry import registry
 
 router = APIRouter(prefix="/api", tags=["summarizer"])
 
@@ -15,62 +33,147 @@ class TextPayload(BaseModel):
     text: constr(strip_whitespace=True, min_length=1)  # type: ignore[name-defined]
 
 
+def _client_id(request: Request) -> str:
+    """Identity used for fair-share scheduling between clients."""
+    client_id = request.headers.get("X-Client-Id")
+    if client_id:
+        return client_id
+    return request.client.host if request.client else "unknown"
+
+
+def _busy(error: scheduler.SchedulerBusy) -> HTTPException:
+    return HTTPException(
+        status_code=503, detail=str(error), headers={"Retry-After": str(error.retry_after)}
+    )
+
+
 @router.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "admission": admission.controller.stats(),
+        "scheduler": scheduler.scheduler.stats(),
+        "pdf": pdf_renderer.renderer.stats(),
+        "degrade": degrade.controller.stats(),
+    }
+
+
+@router.get("/models")
+async def model_status():
+    """Loaded models, their sizes and recent load/evict events."""
+    return registry.stats()
 
 
 @router.post("/summarize-text")
-async def summarize_text(payload: TextPayload):
-    summary, chunk_summaries = summarizer.summarize_text(payload.text)
-    return {"summary": summary, "chunks": chunk_summaries}
+async def summarize_text(payload: TextPayload, request: Request):
+    try:
+        with tiers.request_tier(degrade.controller.choose()) as tier:
+            summary, chunk_summaries, chapters = await run_in_threadpool(
+                scheduler.scheduler.run_as,
+                scheduler.INTERACTIVE,
+                _client_id(request),
+                summarizer.summarize_chapters,
+                payload.text,
+            )
+    except scheduler.SchedulerBusy as e:
+        raise _busy(e)
+    return {"summary": summary, "chunks": chunk_summaries, "chapters": chapters, "tier": tier}
 
 
-@router.post("/transcribe-and-summarize")
-async def transcribe_and_summarize(file: UploadFile = File(...)):
-    suffix = Path(file.filename or "").suffix or ".bin"
-    temp_path = None
+def _process_media(temp_path: Path, title: str) -> dict:
+    """Transcribe, index and summarize a media file on disk; the file is consumed."""
+    # Transcribe audio/video
+    try:
+        timed = transcriber.transcribe_media_timed(temp_path)
+    except RuntimeError as e:
+        # Re-raise with proper HTTP status
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Transcription failed: {str(e)}"
+        )
+
+    transcript = timed.text
+    if not transcript or not transcript.strip():
+        raise HTTPException(
+            status_code=500, 
+            detail="Unable to produce transcript. The audio may be too short, silent, or in an unsupported format."
+        )
+
+    # Index the timestamped segments; search is a bonus, never a failure.
+    try:
+        lecture_id = search_index.index.add_lecture(timed, title)
+    except (RuntimeError, sqlite3.Error) as e:
+        print(f"Warning: could not index transcript for search ({e})")
+        lecture_id = None
+
+    # Summarize transcript
+    try:
+        summary, chunk_summaries, chapters = summarizer.summarize_chapters(transcript)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Summarization failed: {str(e)}"
+        )
+    # Done: a retry no longer needs the transcript checkpoints.
+    transcriber.clear_checkpoints(timed)
+
+    return {
+        "transcript": transcript,
+        "summary": summary,
+        "chunks": chunk_summaries,
+        "chapters": chapters,
+        "lecture_id": lecture_id,
+    }
+
+
+async def _run_media_job(
+    media_path: Path, title: str, client_id: str, claim: Optional[Callable[[], Path]] = None
+) -> dict:
+    """
+    Probe, admit and process ``media_path``; the processed file is deleted.
+
+    With ``claim``, the file still belongs to the caller until the job is
+    admitted: ``claim()`` is then called and returns the file to process.
+    A rejected job (e.g. "retry later") leaves the caller's file in place.
+    """
+    owned = media_path if claim is None else None
     try:
-        # Save uploaded file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            contents = await file.read()
-            if not contents:
-                raise HTTPException(status_code=400, detail="Uploaded file is empty")
-            tmp_file.write(contents)
-            temp_path = Path(tmp_file.name)
-        
-        # Transcribe audio/video
         try:
-            transcript = transcriber.transcribe_media(temp_path)
+            estimate = await run_in_threadpool(admission.estimate_media, media_path)
         except RuntimeError as e:
-            # Re-raise with proper HTTP status
             raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Transcription failed: {str(e)}"
-            )
-        
-        if not transcript or not transcript.strip():
-            raise HTTPException(
-                status_code=500, 
-                detail="Unable to produce transcript. The audio may be too short, silent, or in an unsupported format."
-            )
 
-        # Summarize transcript
         try:
-            summary, chunk_summaries = summarizer.summarize_text(transcript)
-        except Exception as e:
+            async with admission.controller.admit(estimate):
+                if claim is not None:
+                    media_path = owned = claim()
+                # The tier is picked once admitted, from the load at that point.
+                with tiers.request_tier(degrade.controller.choose()) as tier:
+                    # Inference runs in a worker thread so queued requests and
+                    # short text calls keep being served meanwhile.
+                    result = await run_in_threadpool(
+                        scheduler.scheduler.run_as,
+                        scheduler.MEDIA,
+                        client_id,
+                        _process_media,
+                        media_path,
+                        title,
+                    )
+        except admission.AdmissionRejected as e:
+            headers = {"Retry-After": str(e.retry_after)} if e.retry_after else None
             raise HTTPException(
-                status_code=500,
-                detail=f"Summarization failed: {str(e)}"
+                status_code=e.status_code,
+                detail={"message": str(e), "estimate": e.estimate.to_dict()},
+                headers=headers,
             )
-        
-        return {
-            "transcript": transcript,
-            "summary": summary,
-            "chunks": chunk_summaries,
-        }
+        except scheduler.SchedulerBusy as e:
+            raise _busy(e)
+
+        result["admission"] = estimate.to_dict()
+        result["tier"] = tier
+        return result
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
@@ -81,9 +184,130 @@ async def transcribe_and_summarize(file: UploadFile = File(...)):
         )
     finally:
         # Clean up temp file
-        if temp_path and temp_path.exists():
+        if owned and owned.exists():
             try:
-                temp_path.unlink()
+                owned.unlink()
             except Exception:
                 pass  # Ignore cleanup errors
 
+
+def _save_upload(source, suffix: str) -> Path:
+    """Copy an (already spooled) upload to its own temp file; nothing is left behind on failure."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        temp_path = Path(tmp_file.name)
+        try:
+            shutil.copyfileobj(source, tmp_file, UPLOAD_PART_SIZE)
+        except BaseException:
+            tmp_file.close()
+            temp_path.unlink()
+            raise
+    return temp_path
+
+
+@router.post("/transcribe-and-summarize")
+async def transcribe_and_summarize(request: Request, file: UploadFile = File(...)):
+    suffix = Path(file.filename or "").suffix or ".bin"
+    # Stream the upload to disk instead of reading it into memory, off the
+    # event loop: a multi-GB copy must not stall other requests.
+    temp_path = await run_in_threadpool(_save_upload, file.file, suffix)
+
+    if temp_path.stat().st_size == 0:
+        temp_path.unlink()
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+    title = Path(file.filename or "").stem or "Untitled lecture"
+    return await _run_media_job(temp_path, title, _client_id(request))
+
+
+class UploadInitPayload(BaseModel):
+    filename: constr(strip_whitespace=True, min_length=1)  # type: ignore[name-defined]
+    size: int
+
+
+@router.post("/uploads")
+async def init_upload(payload: UploadInitPayload):
+    try:
+        return uploads.create_session(payload.filename, payload.size)
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/uploads/{upload_id}/parts")
+async def upload_part(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    x_part_sha256: str = Header(...),
+):
+    try:
+        return await uploads.write_part(upload_id, offset, request.stream(), x_part_sha256)
+    except uploads.UploadNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/uploads/{upload_id}")
+async def upload_status(upload_id: str):
+    try:
+        return uploads.get_status(upload_id)
+    except uploads.UploadNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_upload(upload_id: str):
+    try:
+        uploads.abort_session(upload_id)
+    except uploads.UploadNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"status": "aborted"}
+
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str, request: Request):
+    try:
+        filename = uploads.get_status(upload_id)["filename"]
+        media_path = uploads.assembled_path(upload_id)
+    except uploads.UploadNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    def claim() -> Path:
+        # The assembled file is handed over as-is; no re-copy into a temp file.
+        try:
+            return uploads.complete_session(upload_id)
+        except uploads.UploadNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    title = Path(filename).stem or "Untitled lecture"
+    try:
+        return await _run_media_job(media_path, title, _client_id(request), claim=claim)
+    except HTTPException as e:
+        # 503 means "retry later": keep the session so the client can call
+        # /complete again without re-uploading. Anything else is final.
+        if e.status_code != 503:
+            try:
+                uploads.abort_session(upload_id)
+            except uploads.UploadNotFoundError:
+                pass
+        raise
+
+
+@router.get("/search")
+async def search_lectures(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Lectures whose transcript mentions ``q``, with timestamped snippets."""
+    started = time.perf_counter()
+    try:
+        results = await run_in_threadpool(search_index.index.search, q, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "query": q,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        "results": results,
+    }
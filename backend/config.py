@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import torch
@@ -7,6 +8,10 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 MODEL_DIR = BASE_DIR / "model"
 WHISPER_DIR = MODEL_DIR / "whisper-base"
 SUMMARIZER_DIR = MODEL_DIR / "Lecture_summarizer"
+FLAN_T5_DIR = MODEL_DIR / "flan-t5-base"
+# Optional smaller "fast" tier, used under load when present (download_models.py --fast).
+WHISPER_FAST_DIR = MODEL_DIR / "whisper-tiny"
+SUMMARIZER_FAST_DIR = MODEL_DIR / "distilbart-cnn-6-6"
 
 
 
@@ -16,3 +21,112 @@ TEXT_CHUNK_WORD_COUNT = 900
 AUDIO_CHUNK_SIZE = 50_000
 TARGET_SAMPLE_RATE = 16_000
 
+
+# Per-window transcription / summarization checkpoints, keyed by content hash.
+CHECKPOINT_DIR = Path(os.getenv("CHECKPOINT_DIR", BASE_DIR / "checkpoints"))
+CHECKPOINT_TTL_SECONDS = int(os.getenv("CHECKPOINT_TTL_SECONDS", 24 * 60 * 60))
+
+# Resumable chunked uploads for large recordings.
+UPLOAD_DIR = BASE_DIR / "uploads"
+UPLOAD_PART_SIZE = 8 * 1024 * 1024
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 8 * 1024 ** 3))
+UPLOAD_SESSION_TTL_SECONDS = 24 * 60 * 60
+
+# Admission control for media jobs, checked against a pre-flight probe.
+ADMISSION_MAX_DURATION_SECONDS = int(os.getenv("ADMISSION_MAX_DURATION_SECONDS", 4 * 60 * 60))
+ADMISSION_MEMORY_BUDGET_BYTES = int(os.getenv("ADMISSION_MEMORY_BUDGET_BYTES", 4 * 1024 ** 3))
+ADMISSION_PROCESSING_BUDGET_SECONDS = int(os.getenv("ADMISSION_PROCESSING_BUDGET_SECONDS", 2 * 60 * 60))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", 8))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = int(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", 10 * 60))
+# Wall-clock processing seconds per second of audio, used for estimates.
+PROCESSING_SECONDS_PER_AUDIO_SECOND = float(
+    os.getenv("PROCESSING_SECONDS_PER_AUDIO_SECOND", 0.1 if DEVICE == "cuda" else 0.5)
+)
+
+# Inference scheduler: concurrent generate() calls across all models, and
+# concurrent jobs allowed per priority class.
+SCHEDULER_INFERENCE_SLOTS = int(os.getenv("SCHEDULER_INFERENCE_SLOTS", 1))
+SCHEDULER_INTERACTIVE_JOBS = int(os.getenv("SCHEDULER_INTERACTIVE_JOBS", 8))
+SCHEDULER_MEDIA_JOBS = int(os.getenv("SCHEDULER_MEDIA_JOBS", 2))
+SCHEDULER_BATCH_JOBS = int(os.getenv("SCHEDULER_BATCH_JOBS", 1))
+# A step waiting this long moves up one priority class (per interval), so a
+# steady stream of interactive work cannot starve media and batch jobs.
+SCHEDULER_AGING_SECONDS = float(os.getenv("SCHEDULER_AGING_SECONDS", 15))
+# Jobs allowed to wait for a job slot at once (each blocks a server thread);
+# beyond that requests get 503.
+SCHEDULER_MAX_WAITING_JOBS = int(os.getenv("SCHEDULER_MAX_WAITING_JOBS", 16))
+
+# Model registry: total memory allowed for loaded models, and how long an
+# unused model stays resident before it is evicted (reloaded on demand).
+MODEL_MEMORY_BUDGET_BYTES = int(os.getenv("MODEL_MEMORY_BUDGET_BYTES", 4 * 1024 ** 3))
+MODEL_IDLE_TTL_SECONDS = int(os.getenv("MODEL_IDLE_TTL_SECONDS", 30 * 60))
+
+# Opt-in accelerated inference: SDPA attention, inference_mode and
+# torch.compile of encoder/decoder with padded static-shape token buckets.
+ACCELERATED_INFERENCE = os.getenv("ACCELERATED_INFERENCE", "0") == "1"
+ACCELERATION_COMPILE = os.getenv("ACCELERATION_COMPILE", "1") == "1"
+ACCELERATION_TOKEN_BUCKETS = (128, 256, 512, 1024)
+
+# Per-node runtime tuning. Values come from the profile written by
+# autotune.py when present; environment variables override the profile.
+NODE_PROFILE_PATH = Path(os.getenv("NODE_PROFILE_PATH", BASE_DIR / "node_profile.json"))
+
+
+def _load_node_profile() -> dict:
+    try:
+        with open(NODE_PROFILE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("settings", {})
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring unreadable node profile {NODE_PROFILE_PATH}: {e}")
+        return {}
+
+
+_NODE_PROFILE = _load_node_profile()
+
+
+def _tuned(name: str, default: int) -> int:
+    return int(os.getenv(name.upper(), _NODE_PROFILE.get(name, default)))
+
+
+# 0 leaves torch's own default in place. These are the server's (one process).
+TORCH_INTRA_OP_THREADS = _tuned("torch_intra_op_threads", 0)
+TORCH_INTER_OP_THREADS = _tuned("torch_inter_op_threads", 0)
+# Worker processes for batch_process.py and torch threads in each of them.
+BATCH_WORKER_COUNT = _tuned("batch_worker_count", 1)
+BATCH_INTRA_OP_THREADS = _tuned("batch_intra_op_threads", 0)
+SUMMARY_BATCH_SIZE = _tuned("summary_batch_size", 1)
+TRANSCRIBE_BATCH_SIZE = _tuned("transcribe_batch_size", 1)
+
+# Full-text index of timestamped transcripts (SQLite FTS5).
+SEARCH_INDEX_PATH = Path(os.getenv("SEARCH_INDEX_PATH", BASE_DIR / "search_index.sqlite3"))
+
+# Topic-based chapter segmentation of transcripts before summarization.
+CHAPTER_SEGMENTATION = os.getenv("CHAPTER_SEGMENTATION", "1") == "1"
+CHAPTER_MIN_WORDS = int(os.getenv("CHAPTER_MIN_WORDS", 150))
+
+# PDF rendering: worker processes, rendered-PDF cache size and a Unicode
+# TrueType font (first existing candidate unless PDF_FONT_PATH is set).
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", 2))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", 64 * 1024 ** 2))
+PDF_FONT_CANDIDATES = [
+    BASE_DIR / "fonts" / "DejaVuSans.ttf",
+    Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
+    Path("/usr/share/fonts/TTF/DejaVuSans.ttf"),
+    Path("/Library/Fonts/Arial Unicode.ttf"),
+    Path("C:/Windows/Fonts/arial.ttf"),
+]
+PDF_FONT_PATH = os.getenv("PDF_FONT_PATH") or next(
+    (str(p) for p in PDF_FONT_CANDIDATES if p.exists()), None
+)
+
+# Load-adaptive degradation to the fast model tier: "auto" switches on queue
+# depth / inference wait time with hysteresis, "off" never, "always" forces it.
+DEGRADE_MODE = os.getenv("DEGRADE_MODE", "auto")
+# Waiting jobs + steps (scheduler) and queued media jobs (admission).
+DEGRADE_QUEUE_DEPTH = int(os.getenv("DEGRADE_QUEUE_DEPTH", 6))
+# Smoothed wait for an inference slot that counts as an SLO breach.
+DEGRADE_WAIT_SLO_SECONDS = float(os.getenv("DEGRADE_WAIT_SLO_SECONDS", 5))
+# Minimum time in degraded mode before switching back, to avoid flapping.
+DEGRADE_MIN_SECONDS = float(os.getenv("DEGRADE_MIN_SECONDS", 30))
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
+from typing import List
+from urllib.parse import quote
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import Response
 from pydantic import BaseModel  # <-- Added this import
-from fpdf import FPDF
 
 from backend.api.routes import router as api_router
+from backend.services import pdf_layout, pdf_renderer
+from backend.services.runtime import apply_thread_settings
+from backend.services.static_assets import StaticAssets
+
+# Thread counts come from backend/config.py (node profile or environment).
+apply_thread_settings()
 
 # Get project root directory
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -33,72 +40,66 @@ app.include_router(api_router)
 class PDFRequest(BaseModel):
     text: str
     filename: str = "summary.pdf"
+    title: str = "Lecture Summary"
+    chunks: List[str] = []
+
+
+def _content_disposition(filename: str) -> str:
+    """Attachment header with an ASCII-safe name plus the UTF-8 original."""
+    name = Path(filename.replace("\\", "/")).name or "summary.pdf"
+    if not name.lower().endswith(".pdf"):
+        name += ".pdf"
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", name[:-4]).strip("._") or "summary"
+    return f"attachment; filename=\"{stem}.pdf\"; filename*=UTF-8''{quote(name)}"
+
 
 # Note: We use /api/download-pdf to match the frontend's default API URL
 @app.post("/api/download-pdf")
 async def download_pdf(request: PDFRequest):
+    document = pdf_layout.make_document(request.text, request.chunks, title=request.title)
     try:
-        # Initialize PDF
-        pdf = FPDF()
-        pdf.add_page()
-        
-        # Set font (Arial/Helvetica, bold, size 16 for title)
-        pdf.set_font("helvetica", "B", 16)
-        
-        # --- FIX: Use standard cell + ln instead of new_x/new_y ---
-        # 0 = width (full page), 10 = height, ln=1 (move to next line), align='C' (center)
-        pdf.cell(0, 10, "Lecture Summary", ln=1, align='C') 
-        
-        pdf.ln(10) # Add extra line break
-        
-        # Set font for body
-        pdf.set_font("helvetica", size=12)
-        
-        # Write text
-        # We replace specific unicode characters that might break standard fonts
-        safe_text = request.text.encode('latin-1', 'replace').decode('latin-1')
-        pdf.multi_cell(0, 10, safe_text)
-        
-        # Output the PDF as bytes
-        pdf_bytes = bytes(pdf.output())
-        
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={request.filename}"
-            }
-        )
+        # Rendered in the worker pool (or served from cache), off the event loop
+        pdf_bytes = await pdf_renderer.renderer.render(document)
     except Exception as e:
         print(f"PDF Error: {e}") 
         raise HTTPException(status_code=500, detail=str(e))
 
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={"Content-Disposition": _content_disposition(request.filename)},
+    )
+
+
+@app.on_event("shutdown")
+def shutdown_pdf_workers():
+    pdf_renderer.renderer.shutdown()
+
 # --- STATIC FILE SERVING (Keep this at the bottom) ---
 if FRONTEND_DIR.exists():
+    # Loaded into memory (with compressed variants) once; restart to pick up edits.
+    static_assets = StaticAssets(FRONTEND_DIR)
+    static_assets.load()
+
     # Serve index.html at root
     @app.get("/")
-    async def serve_frontend():
-        index_file = FRONTEND_DIR / "index.html"
-        if index_file.exists():
-            return FileResponse(str(index_file))
-        return {"message": "AI Lecture Summarizer - Frontend not found"}
+    async def serve_frontend(request: Request):
+        response = static_assets.response("index.html", request)
+        if response is None:
+            return {"message": "AI Lecture Summarizer - Frontend not found"}
+        return response
     
-    # Serve CSS, JS, and other frontend files
+    # Serve CSS, JS, and other frontend files (unknown paths fall back to index.html)
     @app.get("/{filename}")
-    async def serve_frontend_files(filename: str):
+    async def serve_frontend_files(filename: str, request: Request):
         # Don't interfere with API routes
         if filename.startswith("api"):
             return {"error": "Not found"}
         
-        file_path = FRONTEND_DIR / filename
-        if file_path.exists() and file_path.is_file():
-            return FileResponse(str(file_path))
-        
-        # Fallback to index.html for any other path
-        index_file = FRONTEND_DIR / "index.html"
-        if index_file.exists():
-            return FileResponse(str(index_file))
-        return {"error": "File not found"}
+        response = static_assets.response(filename, request)
+        if response is None:
+            return {"error": "File not found"}
+        return response
 else:
     @app.get("/")
     async def root():
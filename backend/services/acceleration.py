@@ -0,0 +1,107 @@
+"""
+Opt-in accelerated execution for the seq2seq models (``ACCELERATED_INFERENCE=1``).
+
+When enabled, models are loaded with scaled-dot-product attention (falling
+back to BetterTransformer when SDPA isn't supported), encoder and decoder are
+wrapped with ``torch.compile``, inputs are padded to a few fixed token
+buckets so the compiled encoder doesn't recompile for every length, and
+generation runs under ``torch.inference_mode``. Any failure falls back to the
+plain eager model. With the flag off, every helper here is a no-op.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Union
+
+import torch
+
+from backend.config import (
+    ACCELERATED_INFERENCE,
+    ACCELERATION_COMPILE,
+    ACCELERATION_TOKEN_BUCKETS,
+)
+
+# Serialises the swap back to eager modules; other threads may be inside
+# generate() on the same shared model when a compiled call fails.
+_fallback_lock = threading.Lock()
+
+
+def from_pretrained(model_cls: Any, source: str, **kwargs: Any) -> Any:
+    """``model_cls.from_pretrained`` with SDPA attention when accelerated."""
+    if ACCELERATED_INFERENCE:
+        try:
+            return model_cls.from_pretrained(source, attn_implementation="sdpa", **kwargs)
+        except (ValueError, TypeError, ImportError) as e:
+            print(f"Warning: SDPA attention unavailable ({e}); loading eager attention.")
+    return model_cls.from_pretrained(source, **kwargs)
+
+
+def optimize(model: Any) -> Any:
+    """Apply BetterTransformer (if SDPA wasn't used) and compile encoder/decoder."""
+    if not ACCELERATED_INFERENCE:
+        return model
+
+    if getattr(model.config, "_attn_implementation", None) != "sdpa":
+        try:
+            model = model.to_bettertransformer()
+        except Exception as e:
+            print(f"Warning: BetterTransformer unavailable ({e}); keeping eager attention.")
+
+    if ACCELERATION_COMPILE and hasattr(torch, "compile"):
+        try:
+            inner = model.model
+            # Keep the eager modules so generate() can fall back to them.
+            model._eager_modules = (inner.encoder, inner.decoder)
+            # Encoder inputs are padded to fixed buckets (static shapes); the
+            # decoder's sequence length grows every step, so it stays dynamic.
+            inner.encoder = torch.compile(inner.encoder, dynamic=False)
+            inner.decoder = torch.compile(inner.decoder, dynamic=True)
+        except Exception as e:
+            _restore_eager(model)
+            print(f"Warning: torch.compile failed ({e}); using eager execution.")
+    return model
+
+
+def _restore_eager(model: Any) -> bool:
+    eager = getattr(model, "_eager_modules", None)
+    if eager is None:
+        return False
+    model.model.encoder, model.model.decoder = eager
+    del model._eager_modules
+    return True
+
+
+def inference_context():
+    """``inference_mode`` when accelerated, otherwise the original ``no_grad``."""
+    return torch.inference_mode() if ACCELERATED_INFERENCE else torch.no_grad()
+
+
+def generate(model: Any, **kwargs: Any) -> Any:
+    """``model.generate`` that drops back to eager modules if compiled code fails."""
+    compiled = hasattr(model, "_eager_modules")
+    try:
+        return model.generate(**kwargs)
+    except Exception as e:
+        if not compiled:
+            raise
+        with _fallback_lock:
+            # Only the first failing thread swaps; later ones just retry eagerly.
+            if _restore_eager(model):
+                print(f"Warning: compiled generate failed ({e}); falling back to eager execution.")
+        return model.generate(**kwargs)
+
+
+def padding_kwargs(tokenizer: Any, texts: Union[str, List[str]], max_length: int) -> Dict[str, Any]:
+    """
+    Tokenizer padding arguments. Accelerated mode pads to the smallest token
+    bucket that fits the longest text, so the compiled encoder sees only a
+    handful of shapes.
+    """
+    if not ACCELERATED_INFERENCE:
+        return {"padding": "longest", "max_length": max_length}
+    if isinstance(texts, str):
+        texts = [texts]
+    encoded = tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
+    length = max(len(ids) for ids in encoded)
+    bucket = next((b for b in ACCELERATION_TOKEN_BUCKETS if b >= length and b <= max_length), max_length)
+    return {"padding": "max_length", "max_length": bucket}
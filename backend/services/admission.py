@@ -0,0 +1,175 @@
+"""
+Admission control for media jobs based on a pre-flight probe of the upload.
+
+Before a file is decoded, its metadata is probed to estimate how much memory
+the decoded PCM will take and how long processing will run. Jobs are then
+admitted, queued (FIFO) until enough of the per-node budget frees up, or
+rejected outright, so one very long recording cannot starve everyone else.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import AsyncIterator, Deque
+
+from backend.config import (
+    ADMISSION_MAX_DURATION_SECONDS,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_MEMORY_BUDGET_BYTES,
+    ADMISSION_PROCESSING_BUDGET_SECONDS,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    PROCESSING_SECONDS_PER_AUDIO_SECOND,
+    TARGET_SAMPLE_RATE,
+)
+from backend.services import transcriber
+
+
+@dataclass
+class MediaEstimate:
+    duration_seconds: float
+    estimated_memory_bytes: int
+    estimated_processing_seconds: float
+    queued_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class AdmissionRejected(RuntimeError):
+    def __init__(self, message: str, estimate: MediaEstimate, status_code: int, retry_after: int = 0):
+        super().__init__(message)
+        self.estimate = estimate
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def estimate_media(path: Path) -> MediaEstimate:
+    """Probe ``path`` and estimate peak decoded-PCM memory and processing time."""
+    duration, sample_rate, channels = transcriber.probe_media(path)
+
+    if path.suffix.lower() == ".wav":
+        # Read as float32 at the native layout, plus the mono mixdown copy.
+        peak_bytes = duration * sample_rate * (channels + 1) * 4
+    else:
+        # pydub holds the 16-bit source and the 16 kHz mono resample at once,
+        # then soundfile reads the converted wav back as float32.
+        conversion = duration * (sample_rate * channels * 2 + TARGET_SAMPLE_RATE * 2)
+        loading = duration * TARGET_SAMPLE_RATE * 4
+        peak_bytes = max(conversion, loading)
+
+    return MediaEstimate(
+        duration_seconds=round(duration, 2),
+        estimated_memory_bytes=int(peak_bytes),
+        estimated_processing_seconds=round(duration * PROCESSING_SECONDS_PER_AUDIO_SECOND, 1),
+    )
+
+
+class AdmissionController:
+    """Tracks in-flight media jobs against the node's memory and time budgets."""
+
+    def __init__(
+        self,
+        memory_budget: int = ADMISSION_MEMORY_BUDGET_BYTES,
+        processing_budget: float = ADMISSION_PROCESSING_BUDGET_SECONDS,
+        max_duration: float = ADMISSION_MAX_DURATION_SECONDS,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.memory_budget = memory_budget
+        self.processing_budget = processing_budget
+        self.max_duration = max_duration
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.memory_in_use = 0
+        self.processing_in_flight = 0.0
+        self._queue: Deque[object] = deque()
+        self._changed: asyncio.Condition | None = None
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the server's running event loop.
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    def _fits(self, estimate: MediaEstimate) -> bool:
+        # An idle node always admits a job that passed the hard limits, so a
+        # single job larger than the processing budget can still run alone.
+        if self.memory_in_use == 0 and self.processing_in_flight == 0:
+            return True
+        return (
+            self.memory_in_use + estimate.estimated_memory_bytes <= self.memory_budget
+            and self.processing_in_flight + estimate.estimated_processing_seconds <= self.processing_budget
+        )
+
+    def stats(self) -> dict:
+        return {
+            "memory_in_use": self.memory_in_use,
+            "memory_budget": self.memory_budget,
+            "processing_in_flight": self.processing_in_flight,
+            "processing_budget": self.processing_budget,
+            "queued": len(self._queue),
+        }
+
+    @asynccontextmanager
+    async def admit(self, estimate: MediaEstimate) -> AsyncIterator[MediaEstimate]:
+        if estimate.duration_seconds > self.max_duration:
+            raise AdmissionRejected(
+                f"Recording is {estimate.duration_seconds / 60:.0f} minutes long; "
+                f"the limit is {self.max_duration / 60:.0f} minutes.",
+                estimate,
+                status_code=413,
+            )
+        if estimate.estimated_memory_bytes > self.memory_budget:
+            raise AdmissionRejected(
+                "Recording needs more memory to decode than this node allows.",
+                estimate,
+                status_code=413,
+            )
+
+        changed = self._condition()
+        ticket = object()
+        started = time.monotonic()
+        async with changed:
+            if self._queue or not self._fits(estimate):
+                if len(self._queue) >= self.max_queue:
+                    raise AdmissionRejected(
+                        "Server is busy processing other recordings. Please retry later.",
+                        estimate,
+                        status_code=503,
+                        retry_after=int(self.processing_in_flight) or 60,
+                    )
+                self._queue.append(ticket)
+                try:
+                    await asyncio.wait_for(
+                        changed.wait_for(lambda: self._queue[0] is ticket and self._fits(estimate)),
+                        timeout=self.queue_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    raise AdmissionRejected(
+                        "Timed out waiting for processing capacity. Please retry later.",
+                        estimate,
+                        status_code=503,
+                        retry_after=60,
+                    )
+                finally:
+                    self._queue.remove(ticket)
+                    changed.notify_all()
+
+            self.memory_in_use += estimate.estimated_memory_bytes
+            self.processing_in_flight += estimate.estimated_processing_seconds
+
+        estimate.queued_seconds = round(time.monotonic() - started, 2)
+        try:
+            yield estimate
+        finally:
+            async with changed:
+                self.memory_in_use -= estimate.estimated_memory_bytes
+                self.processing_in_flight -= estimate.estimated_processing_seconds
+                changed.notify_all()
+
+
+controller = AdmissionController()
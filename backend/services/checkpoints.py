@@ -0,0 +1,125 @@
+"""
+Per-window checkpoint store so long transcriptions/summaries can resume after a crash.
+
+Each job is identified by a content hash (of the uploaded media or of the text
+being summarized) and every completed window is written to its own small JSON
+file. A retried job with the same content skips the windows already on disk.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.config import CHECKPOINT_DIR, CHECKPOINT_TTL_SECONDS
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    """Stream a file through sha256 without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """
+    Windows of one job, stored under ``<root>/<namespace>/<key>/<index>.json``.
+
+    The namespace should encode anything that changes how windows are cut
+    (e.g. the audio chunk size), so stale checkpoints are never reused for a
+    different windowing.
+    """
+
+    def __init__(self, namespace: str, key: str, root: Path = CHECKPOINT_DIR):
+        self.directory = Path(root) / namespace / key
+
+    def _window_path(self, index: int) -> Path:
+        return self.directory / f"{index:06d}.json"
+
+    def load(self, index: int) -> Optional[Any]:
+        path = self._window_path(index)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                return json.load(handle)["value"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError):
+            # A torn or corrupt window is simply recomputed.
+            return None
+
+    def save(self, index: int, value: Any) -> None:
+        """
+        Write one window. Jobs with the same content may save the same window
+        concurrently, or ``clear`` it under each other; a checkpoint is only
+        an optimisation, so a save that loses such a race is dropped.
+        """
+        path = self._window_path(index)
+        for _ in range(2):
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                # A private temp file per writer, so concurrent saves never collide.
+                fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            except (FileNotFoundError, FileExistsError):
+                # Cleared under us: mkdir(exist_ok=True) can still raise
+                # FileExistsError if the directory vanishes mid-call.
+                continue
+            try:
+                with open(fd, "w", encoding="utf-8") as handle:
+                    json.dump({"value": value}, handle, ensure_ascii=False)
+                # Atomic rename so a crash never leaves a half-written window behind.
+                os.replace(tmp_name, path)
+                return
+            except FileNotFoundError:
+                continue  # Cleared while writing; try once more.
+            finally:
+                try:
+                    os.unlink(tmp_name)
+                except FileNotFoundError:
+                    pass
+
+    def load_all(self) -> Dict[int, Any]:
+        windows: Dict[int, Any] = {}
+        if not self.directory.exists():
+            return windows
+        for path in self.directory.glob("*.json"):
+            try:
+                index = int(path.stem)
+            except ValueError:
+                continue
+            value = self.load(index)
+            if value is not None:
+                windows[index] = value
+        return windows
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def prune_stale(max_age: int = CHECKPOINT_TTL_SECONDS, root: Path = CHECKPOINT_DIR) -> None:
+    """Remove job directories that have not been touched for ``max_age`` seconds."""
+    root = Path(root)
+    if not root.exists():
+        return
+    cutoff = time.time() - max_age
+    for namespace in root.iterdir():
+        if not namespace.is_dir():
+            continue
+        for job_dir in namespace.iterdir():
+            try:
+                if job_dir.stat().st_mtime < cutoff:
+                    shutil.rmtree(job_dir, ignore_errors=True)
+            except OSError:
+                pass
@@ -0,0 +1,114 @@
+"""
+Load-adaptive degradation to the fast model tier.
+
+The controller picks a tier for every request from the scheduler and
+admission queue depth and a smoothed wait for an inference slot. It enters
+degraded mode above the thresholds and leaves it only well below them and
+after a minimum dwell time, so it doesn't flap. ``DEGRADE_MODE`` can pin it
+"off" or "always".
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Any, Dict
+
+from backend.config import (
+    DEGRADE_MIN_SECONDS,
+    DEGRADE_MODE,
+    DEGRADE_QUEUE_DEPTH,
+    DEGRADE_WAIT_SLO_SECONDS,
+)
+from backend.services import admission, scheduler, tiers
+from backend.services.tiers import FAST, FULL
+
+
+class DegradeController:
+    def __init__(
+        self,
+        mode: str,
+        queue_depth: int,
+        wait_slo: float,
+        min_seconds: float,
+        half_life: float = 10.0,
+    ):
+        self.mode = mode
+        self.queue_depth = queue_depth
+        self.wait_slo = wait_slo
+        self.min_seconds = min_seconds
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        self._wait_ewma = 0.0
+        self._wait_at = time.monotonic()
+        self._degraded = False
+        self._since = time.monotonic()
+        self._switches = 0
+
+    def observe_wait(self, priority: int, seconds: float) -> None:
+        """Scheduler listener: fold a step's slot wait into the average."""
+        if priority == scheduler.BATCH:
+            return
+        with self._lock:
+            self._wait_ewma = 0.8 * self._decayed_wait() + 0.2 * seconds
+            self._wait_at = time.monotonic()
+
+    def _decayed_wait(self) -> float:
+        # Decays while no steps run, so an idle server leaves degraded mode.
+        idle = time.monotonic() - self._wait_at
+        return self._wait_ewma * math.pow(0.5, idle / self.half_life)
+
+    @staticmethod
+    def _queue_depth() -> int:
+        depth = admission.controller.stats()["queued"]
+        for stats in scheduler.scheduler.stats().values():
+            depth += stats["jobs_waiting"] + stats["steps_waiting"]
+        return depth
+
+    def choose(self) -> str:
+        """Tier for a request starting now."""
+        if self.mode == "off":
+            return FULL
+        if self.mode == "always":
+            return FAST
+        depth = self._queue_depth()
+        with self._lock:
+            wait = self._decayed_wait()
+            if not self._degraded:
+                if depth >= self.queue_depth or wait > self.wait_slo:
+                    self._switch(True, depth, wait)
+            # Leave only well below the thresholds and after a minimum stay.
+            elif (
+                depth <= self.queue_depth // 2
+                and wait < self.wait_slo / 2
+                and time.monotonic() - self._since >= self.min_seconds
+            ):
+                self._switch(False, depth, wait)
+            return FAST if self._degraded else FULL
+
+    def _switch(self, degraded: bool, depth: int, wait: float) -> None:
+        self._degraded = degraded
+        self._since = time.monotonic()
+        self._switches += 1
+        state = "entering" if degraded else "leaving"
+        print(f"Degrade mode: {state} fast tier (queue depth {depth}, slot wait {wait:.1f}s)")
+
+    def stats(self) -> Dict[str, Any]:
+        depth = self._queue_depth()
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "tier": FAST if self.mode == "always" or (self.mode == "auto" and self._degraded) else FULL,
+                "fast_models": tiers.fast_models(),
+                "queue_depth": depth,
+                "queue_depth_threshold": self.queue_depth,
+                "slot_wait_seconds": round(self._decayed_wait(), 2),
+                "slot_wait_slo_seconds": self.wait_slo,
+                "switches": self._switches,
+            }
+
+
+controller = DegradeController(
+    DEGRADE_MODE, DEGRADE_QUEUE_DEPTH, DEGRADE_WAIT_SLO_SECONDS, DEGRADE_MIN_SECONDS
+)
+scheduler.scheduler.add_listener(controller.observe_wait)
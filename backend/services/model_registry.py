@@ -0,0 +1,219 @@
+"""
+Central ownership of loaded models.
+
+Services register a loader per model name instead of caching models forever
+in module globals. The registry loads on demand, reference-counts models in
+use, keeps the total resident size under a memory budget by evicting the
+least recently used idle models, and evicts models idle for longer than a
+TTL. Load/evict events are kept for monitoring.
+"""
+from __future__ import annotations
+
+import gc
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+import torch
+
+from backend.config import MODEL_IDLE_TTL_SECONDS, MODEL_MEMORY_BUDGET_BYTES
+
+
+@dataclass
+class _Entry:
+    loader: Callable[[], Any]
+    estimated_bytes: int
+    model: Any = None
+    size_bytes: int = 0
+    refcount: int = 0
+    last_used: float = 0.0
+    load_lock: threading.Lock = field(default_factory=threading.Lock)
+    loads: int = 0
+    evictions: int = 0
+
+
+def _measure_bytes(obj: Any) -> int:
+    """Sum parameter and buffer sizes of every torch module in ``obj``."""
+    parts = obj if isinstance(obj, (tuple, list)) else (obj,)
+    total = 0
+    for part in parts:
+        if isinstance(part, torch.nn.Module):
+            for tensor in list(part.parameters()) + list(part.buffers()):
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelRegistry:
+    def __init__(self, memory_budget: int, idle_ttl: float):
+        self.memory_budget = memory_budget
+        self.idle_ttl = idle_ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._reaper: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------ setup
+
+    def register(self, name: str, loader: Callable[[], Any], estimated_bytes: int = 0) -> None:
+        """Register (or replace) the loader for ``name``; a stale idle copy is dropped."""
+        with self._lock:
+            old = self._entries.get(name)
+            if old is not None and old.model is not None and old.refcount == 0:
+                self._evict(name, old, reason="replaced")
+            self._entries[name] = _Entry(loader=loader, estimated_bytes=estimated_bytes)
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """``callback(event)`` is called for every load/evict event."""
+        self._listeners.append(callback)
+
+    # ---------------------------------------------------------------- access
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """Yield the loaded model, pinned so it cannot be evicted meanwhile."""
+        entry = self._entry(name)
+        with self._lock:
+            entry.refcount += 1
+        try:
+            yield self._ensure_loaded(name, entry)
+        finally:
+            with self._lock:
+                entry.refcount -= 1
+                entry.last_used = time.monotonic()
+
+    def get(self, name: str) -> Any:
+        """Load (if needed) and return the model without pinning it."""
+        entry = self._entry(name)
+        model = self._ensure_loaded(name, entry)
+        with self._lock:
+            entry.last_used = time.monotonic()
+        return model
+
+    def evict(self, name: str) -> bool:
+        with self._lock:
+            entry = self._entry(name)
+            if entry.model is None or entry.refcount > 0:
+                return False
+            self._evict(name, entry, reason="manual")
+            return True
+
+    def evict_idle(self) -> None:
+        """Evict every unpinned model unused for longer than the idle TTL."""
+        cutoff = time.monotonic() - self.idle_ttl
+        with self._lock:
+            for name, entry in list(self._entries.items()):
+                if entry.model is not None and entry.refcount == 0 and entry.last_used < cutoff:
+                    self._evict(name, entry, reason="idle")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_budget": self.memory_budget,
+                "loaded_bytes": self._loaded_bytes(),
+                "idle_ttl": self.idle_ttl,
+                "models": {
+                    name: {
+                        "loaded": entry.model is not None,
+                        "size_bytes": entry.size_bytes or entry.estimated_bytes,
+                        "refcount": entry.refcount,
+                        "loads": entry.loads,
+                        "evictions": entry.evictions,
+                    }
+                    for name, entry in self._entries.items()
+                },
+                "events": list(self._events),
+            }
+
+    # -------------------------------------------------------------- internals
+
+    def _entry(self, name: str) -> _Entry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise RuntimeError(f"Model '{name}' is not registered") from None
+
+    def _loaded_bytes(self) -> int:
+        return sum(e.size_bytes for e in self._entries.values() if e.model is not None)
+
+    def _ensure_loaded(self, name: str, entry: _Entry) -> Any:
+        model = entry.model
+        if model is not None:
+            with self._lock:
+                self._entries.move_to_end(name)
+            return model
+
+        # One loader per model at a time; other models load concurrently.
+        with entry.load_lock:
+            if entry.model is not None:
+                return entry.model
+            needed = entry.size_bytes or entry.estimated_bytes
+            with self._lock:
+                self._make_room(needed, keep=name)
+
+            started = time.perf_counter()
+            model = entry.loader()
+            seconds = time.perf_counter() - started
+
+            with self._lock:
+                entry.model = model
+                entry.size_bytes = _measure_bytes(model) or entry.estimated_bytes
+                entry.loads += 1
+                entry.last_used = time.monotonic()
+                self._entries.move_to_end(name)
+                self._emit("load", name, size_bytes=entry.size_bytes, seconds=round(seconds, 2))
+                # The estimate may have been low; trim others if now over budget.
+                self._make_room(0, keep=name)
+        self._start_reaper()
+        return model
+
+    def _make_room(self, needed: int, keep: str) -> None:
+        """Evict least recently used idle models until ``needed`` more bytes fit."""
+        for name, entry in list(self._entries.items()):
+            if self._loaded_bytes() + needed <= self.memory_budget:
+                return
+            if name != keep and entry.model is not None and entry.refcount == 0:
+                self._evict(name, entry, reason="budget")
+        if self._loaded_bytes() + needed > self.memory_budget:
+            print(
+                f"Warning: model memory budget exceeded "
+                f"({self._loaded_bytes() + needed} > {self.memory_budget} bytes); "
+                "all other models are in use."
+            )
+
+    def _evict(self, name: str, entry: _Entry, reason: str) -> None:
+        entry.model = None
+        entry.evictions += 1
+        self._emit("evict", name, size_bytes=entry.size_bytes, reason=reason)
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _emit(self, event: str, name: str, **info: Any) -> None:
+        record = {"event": event, "model": name, "time": time.time(), **info}
+        self._events.append(record)
+        print(f"Model registry: {event} {name} {info}")
+        for callback in self._listeners:
+            try:
+                callback(record)
+            except Exception as e:
+                print(f"Warning: model registry listener failed: {e}")
+
+    def _start_reaper(self) -> None:
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap, name="model-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        interval = max(1.0, min(60.0, self.idle_ttl / 4))
+        while True:
+            time.sleep(interval)
+            self.evict_idle()
+
+
+registry = ModelRegistry(MODEL_MEMORY_BUDGET_BYTES, MODEL_IDLE_TTL_SECONDS)
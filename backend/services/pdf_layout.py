@@ -0,0 +1,173 @@
+"""
+The summary PDF layout, rendered with FPDF.
+
+This module runs inside the PDF worker processes, so it deliberately imports
+nothing from the backend (``backend.config`` pulls in torch): settings such
+as the font path are passed in by the caller.
+"""
+from __future__ import annotations
+
+import copy
+import functools
+import io
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Bump when the layout changes so cached PDFs aren't served with the old one.
+LAYOUT_VERSION = 1
+
+_BOLD_SUFFIXES = ("-Bold", "bd")
+
+
+def make_document(
+    summary: str,
+    chunks: Sequence[str] = (),
+    title: str = "Lecture Summary",
+    source: Optional[str] = None,
+    date: Optional[str] = None,
+) -> Dict:
+    """The structured summary + notes layout, as a plain (picklable) dict."""
+    return {
+        "title": title.strip() or "Lecture Summary",
+        "summary": summary.strip(),
+        "chunks": [c.strip() for c in chunks if c and c.strip()],
+        "source": source,
+        "date": date,
+    }
+
+
+# ---------------------------------------------------------------- rendering
+
+@functools.lru_cache(maxsize=None)
+def resolve_font(font_path: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(regular, bold) font files, or None for the built-in Helvetica."""
+    if not font_path:
+        return None
+    regular = Path(font_path)
+    if not regular.is_file():
+        print(f"Warning: PDF font {regular} not found; non-Latin-1 text will be replaced.")
+        return None
+    # DejaVuSans-Bold.ttf / arialbd.ttf; reuse the regular face otherwise.
+    for suffix in _BOLD_SUFFIXES:
+        bold = regular.with_name(regular.stem + suffix + regular.suffix)
+        if bold.is_file():
+            return str(regular), str(bold)
+    return str(regular), str(regular)
+
+
+# (font file, style) -> (file bytes, parsed font) for this worker process.
+_parsed_fonts: Dict[Tuple[str, str], Tuple[bytes, Any]] = {}
+
+
+def _add_font(pdf: Any, family: str, style: str, font_file: str) -> None:
+    """
+    ``pdf.add_font`` with the font's glyph tables parsed once per worker.
+
+    Later documents get a copy of the parsed font with fresh per-document
+    state and a fresh (lazy, so nearly free) fontTools handle: fpdf subsets
+    that handle in place when the PDF is written. fpdf versions whose font
+    objects don't look like this simply parse the font every time.
+    """
+    key = (font_file, style)
+    cached = _parsed_fonts.get(key)
+    fontkey = f"{family.lower()}{style}"
+    if cached is not None:
+        from fontTools import ttLib
+
+        data, parsed = cached
+        font = copy.copy(parsed)
+        font.i = len(pdf.fonts) + 1
+        font.ttfont = ttLib.TTFont(io.BytesIO(data), recalcTimestamp=False, lazy=True)
+        font._hbfont = None
+        font.biggest_size_pt = 0
+        font.missing_glyphs = []
+        font.subset = type(parsed.subset)(font)
+        pdf.fonts[fontkey] = font
+        return
+
+    pdf.add_font(family, style, font_file)
+    font = pdf.fonts[fontkey]
+    if all(hasattr(font, a) for a in ("i", "ttfont", "_hbfont", "biggest_size_pt", "missing_glyphs", "subset")) and (
+        getattr(font, "color_font", None) is None and getattr(font, "collection_font_number", 0) == 0
+    ):
+        _parsed_fonts[key] = (Path(font_file).read_bytes(), copy.copy(font))
+
+
+def init_worker(font_path: Optional[str]) -> None:
+    # Pay the fpdf import and font lookup once per worker, not per render.
+    import fpdf  # noqa: F401
+
+    resolve_font(font_path)
+
+
+def render_document(document: Dict, font_path: Optional[str]) -> bytes:
+    """Render ``document`` (see ``make_document``) to PDF bytes in this process."""
+    from fpdf import FPDF
+
+    fonts = resolve_font(font_path)
+    if fonts:
+        family = "Body"
+
+        def clean(text: str) -> str:
+            return text
+    else:
+        family = "helvetica"
+
+        def clean(text: str) -> str:
+            return text.encode("latin-1", "replace").decode("latin-1")
+
+    class PDF(FPDF):
+        def header(self):
+            self.set_font(family, "B", 15)
+            self.cell(0, 10, clean(document["title"]), align="C")
+            self.ln(15)
+
+        def footer(self):
+            self.set_y(-15)
+            self.set_font(family, "", 8)
+            self.cell(0, 10, f"Page {self.page_no()}", align="C")
+
+    pdf = PDF()
+    if fonts:
+        try:
+            _add_font(pdf, family, "", fonts[0])
+            _add_font(pdf, family, "B", fonts[1])
+        except Exception as e:
+            print(f"Warning: could not load PDF font {fonts[0]} ({e}); using Helvetica.")
+            resolve_font.cache_clear()
+            return render_document(document, font_path=None)
+    pdf.set_title(clean(document["title"]))
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    meta = []
+    if document.get("source"):
+        meta.append(f"Source: {document['source']}")
+    if document.get("date"):
+        meta.append(f"Date: {document['date']}")
+    if meta:
+        pdf.set_font(family, "", 10)
+        pdf.set_text_color(100, 100, 100)
+        pdf.multi_cell(0, 5, clean("\n".join(meta)))
+        pdf.ln(5)
+        pdf.set_text_color(0, 0, 0)
+
+    chunks: List[str] = document.get("chunks") or []
+    if chunks:
+        pdf.set_font(family, "B", 12)
+        pdf.cell(0, 10, "Executive Summary")
+        pdf.ln(10)
+    pdf.set_font(family, "", 11)
+    pdf.multi_cell(0, 7, clean(document["summary"]))
+    pdf.ln(5)
+
+    if chunks:
+        pdf.set_font(family, "B", 12)
+        pdf.cell(0, 10, "Detailed Notes")
+        pdf.ln(10)
+        pdf.set_font(family, "", 11)
+        for i, chunk in enumerate(chunks, 1):
+            pdf.multi_cell(0, 7, clean(f"{i}. {chunk}"))
+            pdf.ln(2)
+
+    return bytes(pdf.output())
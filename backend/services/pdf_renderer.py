@@ -0,0 +1,124 @@
+"""
+PDF rendering for summaries, off the event loop and cached.
+
+Documents (see ``pdf_layout``) are rendered by a small process pool so FPDF
+never blocks the server, with a Unicode TrueType font parsed once per
+worker (falling back to Helvetica with Latin-1 replacement when no font is
+available). Rendered PDFs are kept in an LRU cache keyed by a hash of the
+document's content, and concurrent requests for the same document share a
+single render. Workers only import ``pdf_layout``; the settings here reach
+them as arguments.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import json
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from backend.config import PDF_CACHE_MAX_BYTES, PDF_FONT_PATH, PDF_RENDER_WORKERS
+from backend.services.pdf_layout import LAYOUT_VERSION, init_worker, render_document, resolve_font
+
+
+def document_key(document: Dict, font_path: Optional[str] = PDF_FONT_PATH) -> str:
+    payload = json.dumps([LAYOUT_VERSION, font_path, document], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------- service
+
+class PDFRenderer:
+    """
+    Async front end to the render pool with an LRU cache of rendered PDFs.
+
+    Meant to be used from the event loop thread only; the cache and the
+    in-flight table need no locking there.
+    """
+
+    def __init__(
+        self,
+        workers: int = PDF_RENDER_WORKERS,
+        max_bytes: int = PDF_CACHE_MAX_BYTES,
+        font_path: Optional[str] = PDF_FONT_PATH,
+    ):
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.font_path = font_path
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(self.font_path,),
+            )
+        return self._pool
+
+    async def render(self, document: Dict) -> bytes:
+        key = document_key(document, self.font_path)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            self.misses += 1
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(self._executor(), render_document, document, self.font_path)
+            self._inflight[key] = pending
+            pending.add_done_callback(functools.partial(self._finish, key))
+        # Shielded: a disconnecting client must not cancel a render others wait on.
+        return await asyncio.shield(pending)
+
+    def _finish(self, key: str, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self._store(key, future.result())
+        elif isinstance(error, BrokenProcessPool):
+            # A worker died; start a fresh pool on the next render.
+            self._pool = None
+
+    def _store(self, key: str, pdf: bytes) -> None:
+        if len(pdf) > self.max_bytes:
+            return
+        self._cache[key] = pdf
+        self._cache_bytes += len(pdf)
+        while self._cache_bytes > self.max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    def stats(self) -> Dict:
+        return {
+            "cached": len(self._cache),
+            "cached_bytes": self._cache_bytes,
+            "max_bytes": self.max_bytes,
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "unicode_font": resolve_font(self.font_path) is not None,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+renderer = PDFRenderer()
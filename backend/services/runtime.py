@@ -0,0 +1,22 @@
+"""
+Process-level runtime settings applied once at startup.
+"""
+from __future__ import annotations
+
+import torch
+
+from backend.config import TORCH_INTER_OP_THREADS, TORCH_INTRA_OP_THREADS
+
+
+def apply_thread_settings(
+    intra_op: int = TORCH_INTRA_OP_THREADS, inter_op: int = TORCH_INTER_OP_THREADS
+) -> None:
+    """Set torch thread pools; 0 keeps torch's default for that pool."""
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            # Only allowed before any inter-op parallel work has started.
+            print(f"Warning: could not set inter-op threads ({e})")
@@ -0,0 +1,208 @@
+"""
+Priority-aware scheduling of model inference.
+
+Every request runs as a *job* in one of three priority classes, and every
+``generate`` call inside it is a *step* that must hold one of a small number
+of inference slots. Long jobs take a slot per chunk, so between chunks a
+waiting higher-priority step (e.g. a pasted transcript) is granted the slot
+first: media jobs are effectively preempted at chunk boundaries. Within a
+class, slots go to the client that has been served the fewest steps.
+
+Priorities age: every ``aging_seconds`` a step has waited moves it up one
+class, so lower classes always progress under a steady interactive load.
+Jobs waiting for a job slot each block a server thread, so only
+``max_waiting_jobs`` may wait at once; further jobs are turned away with
+``SchedulerBusy``.
+"""
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Tuple, TypeVar
+
+from backend.config import (
+    SCHEDULER_AGING_SECONDS,
+    SCHEDULER_BATCH_JOBS,
+    SCHEDULER_INFERENCE_SLOTS,
+    SCHEDULER_INTERACTIVE_JOBS,
+    SCHEDULER_MAX_WAITING_JOBS,
+    SCHEDULER_MEDIA_JOBS,
+)
+
+INTERACTIVE = 0
+MEDIA = 1
+BATCH = 2
+
+CLASS_NAMES = {INTERACTIVE: "interactive", MEDIA: "media", BATCH: "batch"}
+
+T = TypeVar("T")
+
+# (priority, client) of the job running in the current thread/task. Code that
+# runs outside any job (CLI, notebooks) is treated as offline batch work.
+_current_job: ContextVar[Tuple[int, str]] = ContextVar("current_job", default=(BATCH, "local"))
+
+
+class SchedulerBusy(RuntimeError):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    priority: int
+    client: str
+    seq: int
+    since: float
+
+
+class InferenceScheduler:
+    def __init__(
+        self,
+        slots: int,
+        job_limits: Dict[int, int],
+        aging_seconds: float = SCHEDULER_AGING_SECONDS,
+        max_waiting_jobs: int = SCHEDULER_MAX_WAITING_JOBS,
+    ):
+        self.slots = slots
+        self.job_limits = job_limits
+        self.aging_seconds = aging_seconds
+        self.max_waiting_jobs = max_waiting_jobs
+        self._cond = threading.Condition()
+        self._free_slots = slots
+        self._waiting: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._served: Dict[int, Dict[str, int]] = {p: {} for p in job_limits}
+        self._jobs_running: Dict[int, int] = {p: 0 for p in job_limits}
+        self._jobs_waiting: Dict[int, int] = {p: 0 for p in job_limits}
+        self._steps_running: Dict[int, int] = {p: 0 for p in job_limits}
+        self._listeners: List[Callable[[int, float], None]] = []
+        # Clock for aging, advanced only together with notify_all() so every
+        # waiter ranks the queue at the same instant and agrees on its head.
+        self._now = time.monotonic()
+
+    def add_listener(self, callback: Callable[[int, float], None]) -> None:
+        """``callback(priority, wait_seconds)`` is called whenever a step gets its slot."""
+        self._listeners.append(callback)
+
+    @contextmanager
+    def job(self, priority: int, client: str) -> Iterator[None]:
+        """Run the enclosed work as a job of ``priority`` on behalf of ``client``."""
+        with self._cond:
+            if (
+                self._jobs_running[priority] >= self.job_limits[priority]
+                and sum(self._jobs_waiting.values()) >= self.max_waiting_jobs
+            ):
+                raise SchedulerBusy(
+                    "Server is busy. Please retry later.", retry_after=int(self.aging_seconds) or 10
+                )
+            self._jobs_waiting[priority] += 1
+            try:
+                self._cond.wait_for(
+                    lambda: self._jobs_running[priority] < self.job_limits[priority]
+                )
+            finally:
+                self._jobs_waiting[priority] -= 1
+            self._jobs_running[priority] += 1
+        token = _current_job.set((priority, client))
+        try:
+            yield
+        finally:
+            _current_job.reset(token)
+            with self._cond:
+                self._jobs_running[priority] -= 1
+                self._cond.notify_all()
+
+    def run_as(self, priority: int, client: str, func: Callable[..., T], *args) -> T:
+        """Call ``func(*args)`` inside a job; handy for ``run_in_threadpool``."""
+        with self.job(priority, client):
+            return func(*args)
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> int:
+        if self.aging_seconds <= 0:
+            return waiter.priority
+        # May go below INTERACTIVE: a long-waiting step overtakes fresh ones.
+        return waiter.priority - int((now - waiter.since) / self.aging_seconds)
+
+    def _next_waiter(self) -> _Waiter:
+        return min(
+            self._waiting,
+            key=lambda w: (
+                self._effective_priority(w, self._now), w.priority, self._served[w.priority][w.client], w.seq
+            ),
+        )
+
+    def _notify(self) -> None:
+        self._now = time.monotonic()
+        self._cond.notify_all()
+
+    @contextmanager
+    def step(self) -> Iterator[None]:
+        """Hold an inference slot for one model call (one chunk/window)."""
+        priority, client = _current_job.get()
+        requested = time.monotonic()
+        with self._cond:
+            served = self._served[priority]
+            if client not in served:
+                # Newcomers start level with the least-served client rather
+                # than at zero, so they can't monopolise the slots.
+                served[client] = min(served.values(), default=0)
+            waiter = _Waiter(priority, client, next(self._seq), requested)
+            self._waiting.append(waiter)
+            self._notify()
+            try:
+                self._cond.wait_for(
+                    lambda: self._free_slots > 0 and self._next_waiter() is waiter
+                )
+            finally:
+                self._waiting.remove(waiter)
+                # Wake the others: the head of the queue may have changed.
+                self._notify()
+            self._free_slots -= 1
+            served[client] += 1
+            self._steps_running[priority] += 1
+        waited = time.monotonic() - requested
+        for callback in self._listeners:
+            try:
+                callback(priority, waited)
+            except Exception as e:
+                print(f"Warning: scheduler listener failed: {e}")
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._free_slots += 1
+                self._steps_running[priority] -= 1
+                if self._steps_running[priority] == 0 and not any(
+                    w.priority == priority for w in self._waiting
+                ):
+                    # Class went idle: start the next burst with a clean slate.
+                    self._served[priority].clear()
+                self._notify()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._cond:
+            return {
+                CLASS_NAMES[p]: {
+                    "jobs_running": self._jobs_running[p],
+                    "jobs_waiting": self._jobs_waiting[p],
+                    "job_limit": self.job_limits[p],
+                    "steps_running": self._steps_running[p],
+                    "steps_waiting": sum(1 for w in self._waiting if w.priority == p),
+                }
+                for p in self.job_limits
+            }
+
+
+scheduler = InferenceScheduler(
+    SCHEDULER_INFERENCE_SLOTS,
+    {
+        INTERACTIVE: SCHEDULER_INTERACTIVE_JOBS,
+        MEDIA: SCHEDULER_MEDIA_JOBS,
+        BATCH: SCHEDULER_BATCH_JOBS,
+    },
+)
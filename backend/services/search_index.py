@@ -0,0 +1,174 @@
+"""
+Full-text search over processed lectures, down to the timestamped segment.
+
+Every transcribed lecture's Whisper segments are stored in a SQLite FTS5
+table, so "where did the lecturer cover X" is answered from the index in
+milliseconds instead of re-transcribing anything. Segments are only a few
+seconds long, so lectures are matched (every term, anywhere in the lecture)
+against a second, lecture-level table, and the segments are then used for
+the timestamped snippets.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from backend.config import SEARCH_INDEX_PATH
+
+if TYPE_CHECKING:
+    from backend.services.transcriber import TimedTranscript
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lectures (
+    id INTEGER PRIMARY KEY,
+    media_hash TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    duration REAL NOT NULL,
+    created REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+    text,
+    lecture_id UNINDEXED,
+    start UNINDEXED,
+    end UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS lecture_text USING fts5(
+    text,
+    lecture_id UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+class SearchIndex:
+    def __init__(self, path: Path = SEARCH_INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            # WAL lets batch workers in other processes write while we read.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            try:
+                conn.executescript(_SCHEMA)
+            except sqlite3.OperationalError as e:
+                conn.close()
+                raise RuntimeError(f"SQLite with FTS5 support is required for search: {e}") from e
+            self._conn = conn
+        return self._conn
+
+    def add_lecture(self, transcript: "TimedTranscript", title: str) -> int:
+        """Index (or re-index) a lecture; returns its id."""
+        rows = [(text, start, end) for start, end, text in transcript.segments() if text]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                existing = conn.execute(
+                    "SELECT id FROM lectures WHERE media_hash = ?", (transcript.media_hash,)
+                ).fetchone()
+                if existing:
+                    lecture_id = existing[0]
+                    conn.execute("DELETE FROM segments WHERE lecture_id = ?", (lecture_id,))
+                    conn.execute("DELETE FROM lecture_text WHERE lecture_id = ?", (lecture_id,))
+                    conn.execute(
+                        "UPDATE lectures SET title = ?, duration = ?, created = ? WHERE id = ?",
+                        (title, transcript.duration, time.time(), lecture_id),
+                    )
+                else:
+                    lecture_id = conn.execute(
+                        "INSERT INTO lectures (media_hash, title, duration, created) VALUES (?, ?, ?, ?)",
+                        (transcript.media_hash, title, transcript.duration, time.time()),
+                    ).lastrowid
+                conn.executemany(
+                    "INSERT INTO segments (text, lecture_id, start, end) VALUES (?, ?, ?, ?)",
+                    [(text, lecture_id, round(start, 2), round(end, 2)) for text, start, end in rows],
+                )
+                conn.execute(
+                    "INSERT INTO lecture_text (text, lecture_id) VALUES (?, ?)",
+                    (" ".join(text for text, _, _ in rows), lecture_id),
+                )
+        return lecture_id
+
+    def search(self, query: str, limit: int = 20, matches_per_lecture: int = 5) -> List[Dict]:
+        """
+        Lectures whose transcript contains every term of ``query``, best
+        first, each with the segments that best match any of the terms, in
+        time order, and their timestamps.
+        """
+        terms = _TERM.findall(query)
+        if not terms:
+            return []
+        # Quote each term so user input can't inject FTS5 query syntax.
+        quoted = ['"' + term.replace('"', "") + '"' for term in terms]
+
+        with self._lock:
+            conn = self._connection()
+            # Lectures containing every term anywhere, ranked as a whole.
+            lectures = conn.execute(
+                """
+                SELECT lecture_id, rank FROM lecture_text
+                WHERE lecture_text MATCH ?
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (" ".join(quoted), limit),
+            ).fetchall()
+            if not lectures:
+                return []
+
+            results: Dict[int, Dict] = {
+                lecture_id: {"lecture_id": lecture_id, "score": -rank, "matches": []}
+                for lecture_id, rank in lectures
+            }
+            placeholders = ",".join("?" * len(results))
+            # The best segments of each of those lectures for any of the
+            # terms. snippet() can't be used under a window function, so the
+            # rows are picked first and their snippets fetched by rowid.
+            any_term = " OR ".join(quoted)
+            rowids = [
+                rowid for (rowid,) in conn.execute(
+                    f"""
+                    SELECT segment FROM (
+                        SELECT rowid AS segment,
+                               row_number() OVER (PARTITION BY lecture_id ORDER BY rank) AS position
+                        FROM segments
+                        WHERE segments MATCH ? AND lecture_id IN ({placeholders})
+                    )
+                    WHERE position <= ?
+                    """,
+                    [any_term, *results, matches_per_lecture],
+                )
+            ]
+            for lecture_id, start, end, snippet in conn.execute(
+                f"""
+                SELECT lecture_id, start, end, snippet(segments, 0, '[', ']', '...', 16)
+                FROM segments
+                WHERE segments MATCH ? AND rowid IN ({",".join("?" * len(rowids))})
+                ORDER BY lecture_id, start
+                """,
+                [any_term, *rowids],
+            ):
+                results[lecture_id]["matches"].append({"start": start, "end": end, "snippet": snippet})
+
+            for lecture_id, title, duration, created in conn.execute(
+                f"SELECT id, title, duration, created FROM lectures WHERE id IN ({placeholders})",
+                list(results),
+            ):
+                results[lecture_id].update(title=title, duration=duration, created=created)
+
+        # Lectures were inserted in rank order, so they are already best first.
+        return list(results.values())
+
+
+index = SearchIndex()
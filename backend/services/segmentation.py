@@ -0,0 +1,201 @@
+"""
+Topic-based chapter segmentation of transcripts.
+
+Sentences are turned into TF-IDF vectors, and the cosine similarity between
+the blocks of sentences on either side of every sentence gap is computed in
+one vectorised pass; each gap's TextTiling depth score says how sharply the
+topic shifts there. Chapters are then chosen by dynamic programming: the
+fewest chapters of ``min_words``..``max_words`` words (so the summarizer is
+called no more often than with fixed-size slicing), with the cuts placed at
+the deepest topic shifts among all such splits.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z][a-z']+")
+
+STOPWORDS = frozenset(
+    """
+    a about above after again all also am an and any are as at be because been
+    before being below between both but by can could did do does doing down
+    during each few for from further get got had has have having he her here
+    hers him his how i if in into is it its itself just know let like me more
+    most my no nor not now of off on once only or other our out over own really
+    right said same say see she should so some such than that the their them
+    then there these they this those through to too under until up us very was
+    way we well were what when where which while who whom why will with would
+    yeah you your going gonna thing things one two okay um uh actually basically
+    """.split()
+)
+
+
+@dataclass
+class Chapter:
+    title: str
+    text: str
+    word_count: int
+    start_sentence: int
+
+
+def split_sentences(text: str, fallback_words: int = 25, max_sentence_words: int = 200) -> List[str]:
+    """
+    Sentences of ``text``. Unpunctuated runs longer than ``max_sentence_words``
+    (or a transcript with no sentence breaks at all) are cut into
+    ``fallback_words``-word pseudo-sentences, so no single "sentence" can
+    exceed the summarizer's input budget.
+    """
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        if len(words) > max_sentence_words:
+            sentences.extend(" ".join(words[i : i + fallback_words]) for i in range(0, len(words), fallback_words))
+        elif words:
+            sentences.append(sentence.strip())
+    if len(sentences) == 1:
+        words = sentences[0].split()
+        if len(words) > fallback_words:
+            return [" ".join(words[i : i + fallback_words]) for i in range(0, len(words), fallback_words)]
+    return sentences
+
+
+def _tfidf(sentences: List[str]) -> tuple:
+    tokens = [[w for w in _WORD.findall(s.lower()) if w not in STOPWORDS] for s in sentences]
+    vocab = {w: i for i, w in enumerate(sorted({w for sent in tokens for w in sent}))}
+    counts = np.zeros((len(sentences), max(len(vocab), 1)), dtype=np.float32)
+    rows = [i for i, sent in enumerate(tokens) for _ in sent]
+    cols = [vocab[w] for sent in tokens for w in sent]
+    np.add.at(counts, (rows, cols), 1.0)
+
+    doc_freq = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + doc_freq)) + 1.0
+    return counts * idf, vocab
+
+
+def _gap_similarity(matrix: np.ndarray, block: int) -> np.ndarray:
+    """Cosine similarity of the ``block`` sentences before vs. after every gap."""
+    n = matrix.shape[0]
+    cumulative = np.vstack([np.zeros((1, matrix.shape[1]), dtype=matrix.dtype), np.cumsum(matrix, axis=0)])
+    gaps = np.arange(1, n)
+    left = cumulative[gaps] - cumulative[np.maximum(gaps - block, 0)]
+    right = cumulative[np.minimum(gaps + block, n)] - cumulative[gaps]
+    norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    dots = np.einsum("ij,ij->i", left, right)
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+
+def _depth_scores(similarity: np.ndarray) -> np.ndarray:
+    """
+    How deep each gap sits in a similarity valley (TextTiling depth score):
+    the climb to the nearest peak on either side. Peaks are found in linear
+    time by propagating run starts with ``maximum.accumulate``.
+    """
+    n = len(similarity)
+    if n == 0:
+        return similarity.copy()
+    index = np.arange(n)
+    # A climb to the left from i continues through i - 1 iff s[i - 1] >= s[i],
+    # so every gap shares its left peak with the start of its run.
+    rises = np.r_[True, similarity[:-1] < similarity[1:]]
+    left = similarity[np.maximum.accumulate(np.where(rises, index, 0))]
+    falls = np.r_[similarity[1:] < similarity[:-1], True]
+    right_start = np.minimum.accumulate(np.where(falls, index, n - 1)[::-1])[::-1]
+    right = similarity[right_start]
+    return (left - similarity) + (right - similarity)
+
+
+def _title(matrix: np.ndarray, vocab: dict, start: int, end: int, terms: int = 3) -> str:
+    if not vocab:
+        return "Untitled"
+    words = np.array(sorted(vocab, key=vocab.get))
+    weights = matrix[start:end].sum(axis=0)
+    top = np.argsort(weights)[::-1][:terms]
+    return ", ".join(words[i].capitalize() for i in top if weights[i] > 0) or "Untitled"
+
+
+def title_of(text: str) -> str:
+    """Title for a whole passage from its highest-weighted TF-IDF terms."""
+    sentences = split_sentences(text)
+    if not sentences:
+        return "Untitled"
+    matrix, vocab = _tfidf(sentences)
+    return _title(matrix, vocab, 0, len(sentences))
+
+
+def segment(
+    text: str,
+    min_words: int = 150,
+    max_words: int = 900,
+    block: int = 4,
+) -> List[Chapter]:
+    """Split ``text`` into the fewest topic-coherent chapters of min..max words."""
+    sentences = split_sentences(text, max_sentence_words=min(200, max_words))
+    if not sentences:
+        return []
+    lengths = np.array([len(s.split()) for s in sentences])
+    matrix, vocab = _tfidf(sentences)
+
+    n = len(sentences)
+    # depth[k]: strength of a cut before sentence k (k = 1..n-1).
+    depth = np.zeros(n + 1)
+    if n > 2 * block:
+        depth[1:n] = _depth_scores(_gap_similarity(matrix, block))
+
+    prefix = np.concatenate([[0], np.cumsum(lengths)])
+    edges = _best_edges(prefix, depth, min_words, max_words)
+    if edges is None:
+        # No split satisfies the minimum (e.g. awkward sentence lengths).
+        edges = _best_edges(prefix, depth, 0, max_words)
+
+    return [
+        _chapter(sentences, lengths, start, end, _title(matrix, vocab, start, end))
+        for start, end in zip(edges, edges[1:])
+    ]
+
+
+def _best_edges(prefix: np.ndarray, depth: np.ndarray, min_words: int, max_words: int):
+    """
+    Chapter edges (sentence indices, 0..n) that minimise the chapter count,
+    then maximise the summed depth of the cuts; None if no split fits.
+    ``prefix`` is the cumulative word count, ``depth`` the cut strengths.
+    """
+    n = len(prefix) - 1
+    if prefix[n] <= max_words:
+        return [0, n]
+    # One chapter outweighs any achievable depth total (each depth is <= 2).
+    chapter_cost = 2.0 * n + 1.0
+    cost = np.full(n + 1, np.inf)
+    cost[0] = 0.0
+    previous = np.zeros(n + 1, dtype=int)
+    # Candidate chapter starts i for an end j satisfy
+    # prefix[j] - max_words <= prefix[i] <= prefix[j] - min_words.
+    lows = np.searchsorted(prefix, prefix - max_words, side="left")
+    highs = np.searchsorted(prefix, prefix - max(min_words, 1), side="right")
+    for j in range(1, n + 1):
+        lo, hi = lows[j], min(highs[j], j)
+        if lo >= hi:
+            continue
+        i = lo + int(np.argmin(cost[lo:hi]))
+        if np.isfinite(cost[i]):
+            cost[j] = cost[i] + chapter_cost - (depth[j] if j < n else 0.0)
+            previous[j] = i
+    if not np.isfinite(cost[n]):
+        return None
+    edges = [n]
+    while edges[-1] > 0:
+        edges.append(int(previous[edges[-1]]))
+    return edges[::-1]
+
+
+def _chapter(sentences: List[str], lengths: np.ndarray, start: int, end: int, title: str) -> Chapter:
+    return Chapter(
+        title=title,
+        text=" ".join(sentences[start:end]),
+        word_count=int(lengths[start:end].sum()),
+        start_sentence=start,
+    )
@@ -0,0 +1,158 @@
+"""
+In-memory frontend asset serving.
+
+Every file under the frontend directory is read once at startup together
+with precompressed gzip (and brotli, when the ``brotli`` package is
+installed) variants and a strong ETag, so serving a request is a dict lookup
+with no disk I/O. Each non-HTML asset is also published under a
+content-fingerprinted name (``app.3f2a9c1d0b.js``) that HTML pages are
+rewritten to reference; those URLs are cached by browsers as immutable,
+while HTML and plain names are revalidated with ``If-None-Match``.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+_MIN_COMPRESS_BYTES = 512
+_FINGERPRINTED = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+
+@dataclass
+class Asset:
+    media_type: str
+    cache_control: str
+    etag: str
+    # Content-Encoding ("identity", "br", "gzip") -> body
+    bodies: Dict[str, bytes]
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: ignore any W/ prefix.
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class StaticAssets:
+    def __init__(self, root: Path, fallback: str = "index.html"):
+        self.root = Path(root)
+        self.fallback = fallback
+        self._assets: Dict[str, Asset] = {}
+
+    def load(self) -> None:
+        """(Re)read every file under ``root`` into memory."""
+        files = {
+            path.relative_to(self.root).as_posix(): path.read_bytes()
+            for path in sorted(self.root.rglob("*"))
+            if path.is_file()
+        }
+
+        assets: Dict[str, Asset] = {}
+        fingerprinted: Dict[str, str] = {}
+        for name, body in files.items():
+            if name.endswith(".html"):
+                continue
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            digest = hashlib.sha256(body).hexdigest()
+            is_fingerprinted = bool(_FINGERPRINTED.search(name))
+            assets[name] = self._build(body, media_type, digest, IMMUTABLE if is_fingerprinted else REVALIDATE)
+            if not is_fingerprinted:
+                stem, dot, suffix = name.rpartition(".")
+                alias = f"{stem}.{digest[:10]}.{suffix}" if dot else f"{name}.{digest[:10]}"
+                assets[alias] = self._build(body, media_type, digest, IMMUTABLE)
+                fingerprinted[name] = alias
+
+        for name, body in files.items():
+            if not name.endswith(".html"):
+                continue
+            body = self._rewrite_references(body.decode("utf-8"), fingerprinted).encode("utf-8")
+            assets[name] = self._build(body, "text/html", hashlib.sha256(body).hexdigest(), REVALIDATE)
+
+        self._assets = assets
+
+    @staticmethod
+    def _rewrite_references(html: str, fingerprinted: Dict[str, str]) -> str:
+        for name, alias in fingerprinted.items():
+            html = re.sub(
+                rf'((?:src|href)=["\'](?:\./|/)?){re.escape(name)}(["\'])',
+                rf"\g<1>{alias}\g<2>",
+                html,
+            )
+        return html
+
+    @staticmethod
+    def _build(body: bytes, media_type: str, digest: str, cache_control: str) -> Asset:
+        bodies = {"identity": body}
+        if media_type.startswith(_COMPRESSIBLE) and len(body) >= _MIN_COMPRESS_BYTES:
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    bodies["br"] = compressed
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                bodies["gzip"] = compressed
+        return Asset(media_type=media_type, cache_control=cache_control, etag=digest[:32], bodies=bodies)
+
+    def get(self, path: str) -> Optional[Asset]:
+        return self._assets.get(path.lstrip("/")) or self._assets.get(self.fallback)
+
+    def response(self, path: str, request: Request) -> Optional[Response]:
+        """The asset at ``path`` (or the fallback page); None if neither exists."""
+        asset = self.get(path)
+        if asset is None:
+            return None
+
+        encoding = "identity"
+        if len(asset.bodies) > 1:
+            accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+            encoding = next(
+                (e for e in ("br", "gzip") if e in asset.bodies and accepted.get(e, accepted.get("*", 0)) > 0),
+                "identity",
+            )
+        # Strong ETags must differ between encodings of the same content.
+        etag = f'"{asset.etag}"' if encoding == "identity" else f'"{asset.etag}-{encoding}"'
+
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+        if len(asset.bodies) > 1:
+            headers["Vary"] = "Accept-Encoding"
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=asset.bodies[encoding], media_type=asset.media_type, headers=headers)
@@ -3,16 +3,27 @@ Utilities for chunking long passages and generating abstractive summaries.
 """
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import List, Tuple
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Tuple
 import os
 import requests
 
-import torch
 from transformers import BartForConditionalGeneration, BartTokenizerFast
 
-from backend.config import DEVICE, SUMMARIZER_DIR, TEXT_CHUNK_WORD_COUNT
+from backend.config import (
+    CHAPTER_MIN_WORDS,
+    CHAPTER_SEGMENTATION,
+    DEVICE,
+    SUMMARIZER_DIR,
+    SUMMARIZER_FAST_DIR,
+    SUMMARY_BATCH_SIZE,
+    TEXT_CHUNK_WORD_COUNT,
+)
 from backend.services.local_variables import DEV_KEY, API_KEY
+from backend.services import acceleration, checkpoints, segmentation, tiers
+from backend.services.model_registry import registry
+from backend.services.scheduler import scheduler
 
 
 import re
@@ -108,42 +119,51 @@ def paraphrase_text(text: str) -> str:
         return text
 
 
-@lru_cache(maxsize=1)
-def _load_model() -> Tuple[BartTokenizerFast, BartForConditionalGeneration]:
+def _load_model(model_dir: Path = SUMMARIZER_DIR) -> Tuple[BartTokenizerFast, BartForConditionalGeneration]:
     
-    tokenizer = BartTokenizerFast.from_pretrained(SUMMARIZER_DIR)
-    model = BartForConditionalGeneration.from_pretrained(SUMMARIZER_DIR).to(DEVICE)
+    tokenizer = BartTokenizerFast.from_pretrained(model_dir)
+    model = acceleration.from_pretrained(BartForConditionalGeneration, model_dir).to(DEVICE)
     model.eval()
-    return tokenizer, model
+    return tokenizer, acceleration.optimize(model)
 
 
+# BART-large in fp32 is ~1.6 GB; the registry measures the real size on load.
+registry.register("summarizer", _load_model, estimated_bytes=1_650_000_000)
+# Distilled BART (6+6 layers, ~0.9 GB) for the fast tier, if installed.
+tiers.register_fast(
+    "summarizer", partial(_load_model, SUMMARIZER_FAST_DIR), SUMMARIZER_FAST_DIR, estimated_bytes=920_000_000
+)
 
 
 def _summarize_chunk(text: str, max_length: int = 256, min_length: int = 128) -> str:
-    tokenizer, model = _load_model()
+    return _summarize_batch([text], max_length=max_length, min_length=min_length)[0]
 
+
+def _summarize_batch(texts: List[str], max_length: int = 256, min_length: int = 128) -> List[str]:
+    """Summarize several chunks in one padded generate() call."""
     # text = clean_text(text)
+
+    with registry.use(tiers.model_name("summarizer")) as (tokenizer, model):
+        inputs = tokenizer(
+            texts, 
+            return_tensors="pt", 
+            truncation=True, 
+            **acceleration.padding_kwargs(tokenizer, texts, max_length=1024),
+        ).to(DEVICE)
+
+        with scheduler.step(), acceleration.inference_context():
+            summary_ids = acceleration.generate(
+                model,
+                input_ids=inputs["input_ids"],
+                attention_mask=inputs["attention_mask"], 
+                max_length=max_length,
+                min_length=min_length,
+                length_penalty=2.0,
+                num_beams=4,
+                early_stopping=True,
+            )
     
-    inputs = tokenizer(
-        text, 
-        return_tensors="pt", 
-        truncation=True, 
-        max_length=1024, 
-        padding="longest"
-    ).to(DEVICE)
-
-    with torch.no_grad():
-        summary_ids = model.generate(
-            inputs["input_ids"],
-            attention_mask=inputs["attention_mask"], 
-            max_length=max_length,
-            min_length=min_length,
-            length_penalty=2.0,
-            num_beams=4,
-            early_stopping=True,
-        )
-    
-    return tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        return tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
 
 
 def summarize_text(long_text: str, chunk_word_count: int = TEXT_CHUNK_WORD_COUNT) -> Tuple[str, List[str]]:
@@ -166,14 +186,98 @@ def summarize_text(long_text: str, chunk_word_count: int = TEXT_CHUNK_WORD_COUNT
         for i in range(0, len(words), chunk_word_count)
     ]
 
-    chunk_summaries: List[str] = []
-    for chunk in chunks:
-        summary = _summarize_chunk(chunk)
-        if summary.strip() != "0":
-            chunk_summaries.append(summary)
+    # Chunk summaries are checkpointed so a retried job only redoes missing chunks.
+    store = checkpoints.CheckpointStore(
+        f"summary-{chunk_word_count}{tiers.checkpoint_suffix('summarizer')}",
+        checkpoints.hash_text(long_text),
+    )
+    done = store.load_all()
+
+    pending = [index for index in range(len(chunks)) if index not in done]
+    for i in range(0, len(pending), SUMMARY_BATCH_SIZE):
+        batch = pending[i : i + SUMMARY_BATCH_SIZE]
+        for index, summary in zip(batch, _summarize_batch([chunks[j] for j in batch])):
+            store.save(index, summary)
+            done[index] = summary
+
+    chunk_summaries: List[str] = [
+        done[index] for index in range(len(chunks)) if done[index].strip() != "0"
+    ]
+    store.clear()
 
     final_raw = ". ".join(s.strip().rstrip('.') for s in chunk_summaries)
 
     final_summary = safe_paraphrase(final_raw)
     
-    return final_summary, chunk_summaries
\ No newline at end of file
+    return final_summary, chunk_summaries
+
+
+def summarize_chapters(
+    long_text: str, max_chapter_words: int = TEXT_CHUNK_WORD_COUNT
+) -> Tuple[str, List[str], List[Dict]]:
+    """
+    Like ``summarize_text``, but chunks follow topic shifts instead of fixed
+    word counts. Returns the overall summary, the per-chapter summaries and a
+    list of chapters (title, size, position and summary).
+    """
+    if not CHAPTER_SEGMENTATION:
+        summary, chunk_summaries = summarize_text(long_text, max_chapter_words)
+        return summary, chunk_summaries, []
+
+    if not long_text or not long_text.strip():
+        return "No text available to summarize.", [], []
+
+    word_count = len(long_text.split())
+    if word_count < max_chapter_words:
+        # Short input is summarized in one call; report it as a single chapter.
+        summary, chunk_summaries = summarize_text(long_text, max_chapter_words)
+        chapters = [{
+            "index": 0,
+            "title": segmentation.title_of(long_text),
+            "word_count": word_count,
+            "start_sentence": 0,
+            "summary": chunk_summaries[0],
+        }]
+        return summary, chunk_summaries, chapters
+
+    chapters = segmentation.segment(long_text, CHAPTER_MIN_WORDS, max_chapter_words)
+
+    store = checkpoints.CheckpointStore(
+        f"chapters-{CHAPTER_MIN_WORDS}-{max_chapter_words}{tiers.checkpoint_suffix('summarizer')}",
+        checkpoints.hash_text(long_text),
+    )
+    done = store.load_all()
+
+    # Batch chapters of similar length together to keep padding waste low;
+    # short topics get a proportionally shorter minimum summary length.
+    pending = sorted(
+        (index for index in range(len(chapters)) if index not in done),
+        key=lambda index: chapters[index].word_count,
+    )
+    for i in range(0, len(pending), SUMMARY_BATCH_SIZE):
+        batch = pending[i : i + SUMMARY_BATCH_SIZE]
+        shortest = min(chapters[j].word_count for j in batch)
+        summaries = _summarize_batch(
+            [chapters[j].text for j in batch], min_length=min(128, max(32, shortest // 2))
+        )
+        for index, summary in zip(batch, summaries):
+            store.save(index, summary)
+            done[index] = summary
+
+    chapter_dicts: List[Dict] = []
+    for index, chapter in enumerate(chapters):
+        if done[index].strip() == "0":
+            continue
+        chapter_dicts.append({
+            "index": index,
+            "title": chapter.title,
+            "word_count": chapter.word_count,
+            "start_sentence": chapter.start_sentence,
+            "summary": done[index],
+        })
+    store.clear()
+
+    chunk_summaries = [chapter["summary"] for chapter in chapter_dicts]
+    final_raw = ". ".join(s.strip().rstrip('.') for s in chunk_summaries)
+
+    return safe_paraphrase(final_raw), chunk_summaries, chapter_dicts
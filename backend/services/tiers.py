@@ -0,0 +1,74 @@
+"""
+Model tiers.
+
+Each model may have a smaller "fast" variant registered next to it (e.g.
+``whisper`` / ``whisper:fast``). The tier chosen for a request (see
+``degrade.py``) travels with it in a context variable; model code asks
+``model_name()`` which registry entry to use, which falls back to the full
+model when no fast variant is installed.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from backend.services.model_registry import registry
+
+FULL = "full"
+FAST = "fast"
+
+_current_tier: ContextVar[str] = ContextVar("model_tier", default=FULL)
+# Registry names actually used by the current request, for the response.
+_models_used: ContextVar[Optional[Set[str]]] = ContextVar("models_used", default=None)
+
+_fast_models: Set[str] = set()
+
+
+def register_fast(
+    base: str, loader: Callable[[], Any], model_dir: Optional[Path], estimated_bytes: int = 0
+) -> None:
+    """Register ``<base>:fast`` if its files are installed in ``model_dir`` (None: no check)."""
+    if model_dir is not None and not (model_dir / "config.json").exists():
+        return
+    registry.register(f"{base}:{FAST}", loader, estimated_bytes=estimated_bytes)
+    _fast_models.add(base)
+
+
+def fast_models() -> List[str]:
+    return sorted(_fast_models)
+
+
+def model_name(base: str) -> str:
+    """Registry name of ``base`` for the current request's tier."""
+    name = f"{base}:{FAST}" if _current_tier.get() == FAST and base in _fast_models else base
+    used = _models_used.get()
+    if used is not None:
+        used.add(name)
+    return name
+
+
+def checkpoint_suffix(base: str) -> str:
+    """Keeps checkpoints of the fast and full models apart."""
+    return f"-{FAST}" if model_name(base) != base else ""
+
+
+@contextmanager
+def request_tier(tier: str) -> Iterator[Dict[str, Any]]:
+    """
+    Run the enclosed request at ``tier``. Yields the annotation for the
+    response, whose ``models`` fill in as models are used.
+    """
+    used: Set[str] = set()
+    annotation: Dict[str, Any] = {"tier": tier, "models": []}
+    tier_token = _current_tier.set(tier)
+    used_token = _models_used.set(used)
+    try:
+        yield annotation
+    finally:
+        _models_used.reset(used_token)
+        _current_tier.reset(tier_token)
+        annotation["models"] = sorted(used)
+        # Report the tier actually served, e.g. "full" if no fast model exists.
+        annotation["tier"] = FAST if any(name.endswith(f":{FAST}") for name in used) else FULL
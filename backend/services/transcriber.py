@@ -7,14 +7,16 @@ import os
 os.environ["PATH"] += os.pathsep + r"C:\ffmpeg"
 
 import tempfile
-from functools import lru_cache
+from array import array
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, List, Tuple
 
 import numpy as np
 import soundfile as sf
-import torch
 from pydub import AudioSegment
+from pydub.utils import mediainfo
 AudioSegment.converter = r"C:\ffmpeg\ffmpeg.exe"
 AudioSegment.ffprobe   = r"C:\ffmpeg\ffprobe.exe"
 from transformers import WhisperForConditionalGeneration, WhisperProcessor
@@ -23,53 +25,98 @@ from backend.config import (
     AUDIO_CHUNK_SIZE,
     DEVICE,
     TARGET_SAMPLE_RATE,
+    TRANSCRIBE_BATCH_SIZE,
     WHISPER_DIR,
+    WHISPER_FAST_DIR,
 )
+from backend.services import acceleration, checkpoints, tiers
+from backend.services.model_registry import registry
+from backend.services.scheduler import scheduler
 
 
-@lru_cache(maxsize=1)
-def _load_whisper() -> Tuple[WhisperProcessor, WhisperForConditionalGeneration]:
+def _load_whisper(model_dir: Path = WHISPER_DIR) -> Tuple[WhisperProcessor, WhisperForConditionalGeneration]:
     """
     Load Whisper model from local directory. If model files are missing,
     this will attempt to download from Hugging Face (requires internet).
     """
-    if not WHISPER_DIR.exists() or not any(WHISPER_DIR.iterdir()):
+    if not model_dir.exists() or not any(model_dir.iterdir()):
         raise RuntimeError(
-            f"Whisper model directory not found at {WHISPER_DIR}. "
+            f"Whisper model directory not found at {model_dir}. "
             "Please run model/whisper-base/whisper_load.py to download the model first, "
             "or ensure the model files are present in the directory."
         )
     
     # Check if config.json exists (indicates model is present)
-    config_file = WHISPER_DIR / "config.json"
+    config_file = model_dir / "config.json"
     if not config_file.exists():
         raise RuntimeError(
-            f"Whisper model files not found in {WHISPER_DIR}. "
+            f"Whisper model files not found in {model_dir}. "
             "The model needs to be downloaded. Run: python model/whisper-base/whisper_load.py"
         )
     
     try:
-        processor = WhisperProcessor.from_pretrained(str(WHISPER_DIR), local_files_only=True)
-        model = WhisperForConditionalGeneration.from_pretrained(str(WHISPER_DIR), local_files_only=True).to(DEVICE)
+        processor = WhisperProcessor.from_pretrained(str(model_dir), local_files_only=True)
+        model = acceleration.from_pretrained(
+            WhisperForConditionalGeneration, str(model_dir), local_files_only=True
+        ).to(DEVICE)
         model.eval()
-        return processor, model
+        # Whisper features are always padded to 30s, so shapes are already static.
+        return processor, acceleration.optimize(model)
     except Exception as e:
         # If local_files_only fails, try without it (will download if needed)
         if "local_files_only" in str(e).lower():
             raise RuntimeError(
-                f"Whisper model files incomplete in {WHISPER_DIR}. "
+                f"Whisper model files incomplete in {model_dir}. "
                 "Please run: python model/whisper-base/whisper_load.py to download the complete model."
             ) from e
         raise RuntimeError(f"Failed to load Whisper model: {str(e)}") from e
 
 
+registry.register("whisper", _load_whisper, estimated_bytes=300_000_000)
+# whisper-tiny (~150 MB) for the fast tier, if installed.
+tiers.register_fast("whisper", partial(_load_whisper, WHISPER_FAST_DIR), WHISPER_FAST_DIR, estimated_bytes=150_000_000)
+
+
+def probe_media(input_path: Path) -> Tuple[float, int, int]:
+    """
+    Read duration, sample rate and channel count from container metadata
+    without decoding the audio. Returns ``(duration_seconds, sample_rate, channels)``.
+    """
+    try:
+        info = sf.info(str(input_path))
+        return float(info.duration), int(info.samplerate), int(info.channels)
+    except RuntimeError:
+        pass  # Not a format libsndfile understands; fall back to ffprobe.
+
+    try:
+        info = mediainfo(str(input_path))
+    except OSError as e:
+        raise RuntimeError(
+            "ffmpeg is required for audio/video processing. "
+            "Please install ffmpeg and ensure it's in your PATH. "
+            "Download from: https://ffmpeg.org/download.html"
+        ) from e
+
+    try:
+        duration = float(info["duration"])
+    except (KeyError, ValueError):
+        raise RuntimeError("Could not read media duration. The file may be corrupt or unsupported.")
+    sample_rate = int(info.get("sample_rate") or TARGET_SAMPLE_RATE)
+    channels = int(info.get("channels") or 1)
+    return duration, sample_rate, channels
+
+
 def _ensure_wav(input_path: Path) -> Path:
     if input_path.suffix.lower() == ".wav":
         return input_path
     try:
         audio = AudioSegment.from_file(str(input_path))
         audio = audio.set_channels(1).set_frame_rate(TARGET_SAMPLE_RATE)
-        wav_path = input_path.with_suffix(".wav")
+        # Convert into the temp dir rather than next to the input, which may be
+        # a user's file (batch CLI) with a sibling .wav we must not clobber.
+        fd, wav_name = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        wav_path = Path(wav_name)
         audio.export(str(wav_path), format="wav")
         return wav_path
     except Exception as e:
@@ -83,6 +130,14 @@ def _ensure_wav(input_path: Path) -> Path:
         raise RuntimeError(f"Failed to convert audio file: {error_msg}") from e
 
 
+def _remove(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)  # type: ignore[attr-defined]
+    except TypeError:
+        if path.exists():
+            path.unlink()
+
+
 def _load_audio(wav_path: Path) -> Tuple[np.ndarray, int]:
     speech, sample_rate = sf.read(wav_path, dtype="float32")
     if speech.ndim > 1:
@@ -90,54 +145,153 @@ def _load_audio(wav_path: Path) -> Tuple[np.ndarray, int]:
     return speech, sample_rate
 
 
-def transcribe_media(temp_file: Path) -> str:
+Segment = Tuple[float, float, str]
+
+
+@dataclass
+class TimedTranscript:
     """
-    Convert any supported media file to mono 16k wav, then run chunked Whisper
-    inference to produce a transcript string.
+    Transcript text plus Whisper segment timings, kept as flat arrays rather
+    than per-segment dicts: segment ``i`` is ``text[offsets[i]:offsets[i + 1]]``
+    and spans ``starts[i]``..``ends[i]`` seconds into the recording.
     """
-    try:
-        cleaned_path = _ensure_wav(temp_file)
-        speech, sample_rate = _load_audio(cleaned_path)
-    except Exception as e:
-        # Clean up temp file on error
-        try:
-            temp_file.unlink(missing_ok=True)  # type: ignore[attr-defined]
-        except (TypeError, AttributeError):
-            if temp_file.exists():
-                temp_file.unlink()
-        raise
-    
-    processor, model = _load_whisper()
 
-    transcripts = []
-    for start in range(0, len(speech), AUDIO_CHUNK_SIZE):
-        end = min(start + AUDIO_CHUNK_SIZE, len(speech))
-        chunk = speech[start:end]
+    text: str
+    offsets: array = field(default_factory=lambda: array("I"))
+    starts: array = field(default_factory=lambda: array("f"))
+    ends: array = field(default_factory=lambda: array("f"))
+    media_hash: str = ""
+    duration: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def segments(self) -> Iterator[Segment]:
+        bounds = list(self.offsets) + [len(self.text)]
+        for i in range(len(self.offsets)):
+            yield self.starts[i], self.ends[i], self.text[bounds[i] : bounds[i + 1]].strip()
+
+    @classmethod
+    def from_windows(cls, windows: List[List[Segment]], window_seconds: float, **kwargs) -> "TimedTranscript":
+        """Join per-window segments (window-relative times) into one transcript."""
+        transcript = cls(text="", **kwargs)
+        parts: List[str] = []
+        length = 0
+        for index, segments in enumerate(windows):
+            base = index * window_seconds
+            for start, end, text in segments:
+                if parts:
+                    parts.append(" ")
+                    length += 1
+                transcript.offsets.append(length)
+                transcript.starts.append(base + start)
+                transcript.ends.append(base + end)
+                parts.append(text)
+                length += len(text)
+        transcript.text = "".join(parts)
+        return transcript
+
+
+def _transcribe_batch(chunks: List[np.ndarray], sample_rate: int) -> List[List[Segment]]:
+    """
+    Run Whisper over several audio windows in one generate() call and return
+    each window's ``(start, end, text)`` segments, timed relative to the window.
+    """
+    with registry.use(tiers.model_name("whisper")) as (processor, model):
         input_features = processor(
-            chunk, sampling_rate=sample_rate, return_tensors="pt"
+            chunks, sampling_rate=sample_rate, return_tensors="pt"
         ).input_features.to(DEVICE)
-        with torch.no_grad():
-            pred_ids = model.generate(input_features, max_new_tokens=400,language="en", task="transcribe")
-        chunk_transcript = processor.batch_decode(
-            pred_ids, skip_special_tokens=True
-        )[0]
-        transcripts.append(chunk_transcript)
+        with scheduler.step(), acceleration.inference_context():
+            pred_ids = acceleration.generate(
+                model,
+                input_features=input_features,
+                max_new_tokens=400,
+                language="en",
+                task="transcribe",
+                return_timestamps=True,
+            )
+        decoded = processor.batch_decode(pred_ids, skip_special_tokens=True, output_offsets=True)
 
-    transcript = " ".join(transcripts).strip()
+    windows: List[List[Segment]] = []
+    for item, chunk in zip(decoded, chunks):
+        window_end = len(chunk) / sample_rate
+        segments = [
+            (float(offset["timestamp"][0]), float(offset["timestamp"][1] or window_end), offset["text"].strip())
+            for offset in item["offsets"]
+            if offset["text"].strip()
+        ]
+        if not segments and item["text"].strip():
+            # No timestamp tokens emitted: treat the whole window as one segment.
+            segments = [(0.0, window_end, item["text"].strip())]
+        windows.append(segments)
+    return windows
 
-    # Clean up converted wav files to avoid disk bloat
-    if cleaned_path != temp_file:
-        try:
-            cleaned_path.unlink(missing_ok=True)  # type: ignore[attr-defined]
-        except TypeError:
-            if cleaned_path.exists():
-                cleaned_path.unlink()
 
+def _transcript_store(media_hash: str) -> checkpoints.CheckpointStore:
+    return checkpoints.CheckpointStore(
+        f"transcript-ts-{AUDIO_CHUNK_SIZE}{tiers.checkpoint_suffix('whisper')}", media_hash
+    )
+
+
+def clear_checkpoints(transcript: TimedTranscript) -> None:
+    """Drop the window checkpoints behind ``transcript`` once its job is done."""
+    _transcript_store(transcript.media_hash).clear()
+
+
+def transcribe_media(temp_file: Path, delete_source: bool = True) -> str:
+    """
+    Convert any supported media file to mono 16k wav, then run chunked Whisper
+    inference to produce a transcript string.
+
+    ``temp_file`` is deleted afterwards unless ``delete_source`` is False.
+    """
+    return transcribe_media_timed(temp_file, delete_source).text
+
+
+def transcribe_media_timed(temp_file: Path, delete_source: bool = True) -> TimedTranscript:
+    """
+    Same as ``transcribe_media`` but keeps Whisper's segment timestamps.
+
+    Every decoded window is checkpointed under the hash of the uploaded media,
+    so a retried job for the same file resumes from the last completed window.
+    The checkpoints outlive this call, so a job that died during
+    summarization skips transcription entirely on retry; callers drop them
+    with ``clear_checkpoints`` once the whole job has succeeded, and
+    abandoned jobs age out.
+    """
+    checkpoints.prune_stale()
     try:
-        temp_file.unlink(missing_ok=True)  # type: ignore[attr-defined]
-    except TypeError:
-        if temp_file.exists():
-            temp_file.unlink()
+        media_hash = checkpoints.hash_file(temp_file)
+        store = _transcript_store(media_hash)
+        cleaned_path = _ensure_wav(temp_file)
+        try:
+            speech, sample_rate = _load_audio(cleaned_path)
+
+            done = store.load_all()
+            if done:
+                print(f"Resuming transcription from checkpoint ({len(done)} windows done)")
+
+            starts = range(0, len(speech), AUDIO_CHUNK_SIZE)
+            pending = [index for index in range(len(starts)) if index not in done]
+            for i in range(0, len(pending), TRANSCRIBE_BATCH_SIZE):
+                batch = pending[i : i + TRANSCRIBE_BATCH_SIZE]
+                chunks = [speech[starts[j] : starts[j] + AUDIO_CHUNK_SIZE] for j in batch]
+                for index, segments in zip(batch, _transcribe_batch(chunks, sample_rate)):
+                    store.save(index, segments)
+                    done[index] = segments
+        finally:
+            # Clean up converted wav files to avoid disk bloat, on success or failure
+            if cleaned_path != temp_file:
+                _remove(cleaned_path)
+    finally:
+        if delete_source:
+            _remove(temp_file)
 
+    transcript = TimedTranscript.from_windows(
+        [done[index] for index in range(len(starts))],
+        AUDIO_CHUNK_SIZE / sample_rate,
+        media_hash=media_hash,
+        duration=len(speech) / sample_rate,
+    )
     return transcript
 
@@ -0,0 +1,230 @@
+"""
+Resumable chunked uploads written straight to disk.
+
+A session is created with the final file size, verified parts are written at
+their byte offset into a preallocated file (so parts may arrive in any order
+and in parallel), and completing the session renames the file in place and hands its
+path to the transcription pipeline without copying it. The session is only
+consumed once the job has been admitted, so a client told to retry later
+does not have to upload the file again.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Tuple
+
+from backend.config import (
+    UPLOAD_DIR,
+    UPLOAD_MAX_BYTES,
+    UPLOAD_PART_SIZE,
+    UPLOAD_SESSION_TTL_SECONDS,
+)
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# Guards read-modify-write of session manifests; parts themselves are written
+# concurrently since they target disjoint byte ranges.
+_manifest_lock = threading.Lock()
+
+
+class UploadNotFoundError(RuntimeError):
+    pass
+
+
+def _session_dir(upload_id: str) -> Path:
+    if not _UPLOAD_ID.match(upload_id):
+        raise UploadNotFoundError(f"Unknown upload: {upload_id}")
+    directory = UPLOAD_DIR / upload_id
+    if not (directory / "manifest.json").exists():
+        raise UploadNotFoundError(f"Unknown upload: {upload_id}")
+    return directory
+
+
+def _read_manifest(directory: Path) -> Dict:
+    with open(directory / "manifest.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(directory: Path, manifest: Dict) -> None:
+    tmp_path = directory / "manifest.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, directory / "manifest.json")
+
+
+def _merged_ranges(parts: Dict[str, Dict]) -> List[Tuple[int, int]]:
+    ranges = sorted((int(offset), int(offset) + part["length"]) for offset, part in parts.items())
+    merged: List[Tuple[int, int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def prune_stale(max_age: int = UPLOAD_SESSION_TTL_SECONDS) -> None:
+    if not UPLOAD_DIR.exists():
+        return
+    cutoff = time.time() - max_age
+    for directory in UPLOAD_DIR.iterdir():
+        try:
+            if directory.is_dir() and directory.stat().st_mtime < cutoff:
+                shutil.rmtree(directory, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def create_session(filename: str, size: int) -> Dict:
+    if size <= 0:
+        raise RuntimeError("Upload size must be positive")
+    if size > UPLOAD_MAX_BYTES:
+        raise RuntimeError(f"Upload exceeds the maximum size of {UPLOAD_MAX_BYTES} bytes")
+
+    prune_stale()
+    upload_id = uuid.uuid4().hex
+    directory = UPLOAD_DIR / upload_id
+    directory.mkdir(parents=True)
+
+    # Preallocate so every part can be written at its offset independently.
+    with open(directory / "data.part", "wb") as f:
+        f.truncate(size)
+
+    manifest = {
+        "upload_id": upload_id,
+        "filename": filename,
+        "suffix": Path(filename or "").suffix or ".bin",
+        "size": size,
+        "created": time.time(),
+        "parts": {},
+    }
+    _write_manifest(directory, manifest)
+    return {"upload_id": upload_id, "size": size, "part_size": UPLOAD_PART_SIZE}
+
+
+async def write_part(
+    upload_id: str, offset: int, body: AsyncIterator[bytes], expected_sha256: str
+) -> Dict:
+    """
+    Stream one part to ``offset``, verifying its sha256.
+
+    The part is staged in its own file and only copied into the data file
+    once its checksum matches, so a bad or interrupted retry of a part that
+    was already received never corrupts the verified bytes.
+    """
+    directory = _session_dir(upload_id)
+    manifest = _read_manifest(directory)
+    if manifest.get("assembled"):
+        raise RuntimeError("Upload is already complete")
+    size = manifest["size"]
+    if offset < 0 or offset >= size:
+        raise RuntimeError(f"Offset {offset} is outside the upload (size {size})")
+
+    staged = directory / f"part-{offset}-{uuid.uuid4().hex}.tmp"
+    try:
+        digest = hashlib.sha256()
+        length = 0
+        with open(staged, "wb") as f:
+            async for chunk in body:
+                if not chunk:
+                    continue
+                length += len(chunk)
+                if length > UPLOAD_PART_SIZE or offset + length > size:
+                    raise RuntimeError("Part exceeds the part size or the declared upload size")
+                digest.update(chunk)
+                f.write(chunk)
+
+        if length == 0:
+            raise RuntimeError("Part is empty")
+        if digest.hexdigest() != expected_sha256.lower():
+            raise RuntimeError(f"Checksum mismatch for part at offset {offset}")
+
+        try:
+            with open(staged, "rb") as src, open(directory / "data.part", "r+b") as dst:
+                dst.seek(offset)
+                shutil.copyfileobj(src, dst, UPLOAD_PART_SIZE)
+        except FileNotFoundError:
+            # Assembled (or aborted) while this part was streaming.
+            raise RuntimeError("Upload is already complete") from None
+    finally:
+        try:
+            staged.unlink()
+        except FileNotFoundError:
+            pass
+
+    with _manifest_lock:
+        manifest = _read_manifest(directory)
+        manifest["parts"][str(offset)] = {"length": length, "sha256": expected_sha256.lower()}
+        _write_manifest(directory, manifest)
+        received = sum(end - start for start, end in _merged_ranges(manifest["parts"]))
+    return {"offset": offset, "length": length, "received_bytes": received}
+
+
+def get_status(upload_id: str) -> Dict:
+    directory = _session_dir(upload_id)
+    with _manifest_lock:
+        manifest = _read_manifest(directory)
+    ranges = _merged_ranges(manifest["parts"])
+    return {
+        "upload_id": upload_id,
+        "filename": manifest["filename"],
+        "size": manifest["size"],
+        "part_size": UPLOAD_PART_SIZE,
+        "received_bytes": sum(end - start for start, end in ranges),
+        "parts": sorted(int(offset) for offset in manifest["parts"]),
+    }
+
+
+def assembled_path(upload_id: str) -> Path:
+    """
+    Verify every byte has arrived and return the assembled file's path.
+
+    The data file is renamed to carry the original extension so ffmpeg can
+    detect the container, but stays inside the session: it can be probed and
+    the job retried any number of times until ``complete_session``.
+    """
+    directory = _session_dir(upload_id)
+    with _manifest_lock:
+        manifest = _read_manifest(directory)
+        ranges = _merged_ranges(manifest["parts"])
+        if ranges != [(0, manifest["size"])]:
+            received = sum(end - start for start, end in ranges)
+            raise RuntimeError(
+                f"Upload incomplete: received {received} of {manifest['size']} bytes"
+            )
+        media_path = directory / f"data{manifest['suffix']}"
+        if not manifest.get("assembled"):
+            os.replace(directory / "data.part", media_path)
+            manifest["assembled"] = True
+            _write_manifest(directory, manifest)
+    return media_path
+
+
+def complete_session(upload_id: str) -> Path:
+    """
+    Take the assembled file out of the session and delete the session.
+
+    The file is moved (not copied); the caller owns it afterwards.
+    """
+    assembled = assembled_path(upload_id)
+    with _manifest_lock:
+        if not assembled.exists():
+            # Claimed by a concurrent /complete call.
+            raise UploadNotFoundError(f"Unknown upload: {upload_id}")
+        media_path = UPLOAD_DIR / f"{upload_id}{assembled.suffix}"
+        os.replace(assembled, media_path)
+        shutil.rmtree(assembled.parent, ignore_errors=True)
+    return media_path
+
+
+def abort_session(upload_id: str) -> None:
+    directory = _session_dir(upload_id)
+    shutil.rmtree(directory, ignore_errors=True)
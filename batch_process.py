@@ -0,0 +1,188 @@
+"""
+Offline batch processing of a directory of lecture recordings.
+
+Walks a directory, transcribes and summarizes every media file across a pool
+of worker processes (models are loaded once per worker), and writes the
+transcript, TXT summary, PDF summary and a JSON manifest per lecture.
+Files whose manifest already exists in the output directory are skipped.
+
+Usage:
+    python batch_process.py <input_dir> [--output DIR] [--workers N] [--threads N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import BATCH_INTRA_OP_THREADS, BATCH_WORKER_COUNT  # noqa: E402
+
+MEDIA_EXTENSIONS = {
+    ".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac", ".wma",
+    ".mp4", ".mkv", ".mov", ".avi", ".webm",
+}
+
+
+def output_name(input_dir, media_path):
+    """Flatten the path relative to input_dir so nested lectures don't collide."""
+    relative = media_path.relative_to(input_dir).with_suffix("")
+    return "__".join(relative.parts)
+
+
+def find_media(input_dir):
+    return sorted(
+        path for path in input_dir.rglob("*")
+        if path.is_file() and path.suffix.lower() in MEDIA_EXTENSIONS
+    )
+
+
+def init_worker(threads):
+    """Runs once per worker process: pin thread count and load both models."""
+    from backend.services.runtime import apply_thread_settings
+
+    apply_thread_settings(intra_op=threads)
+
+    from backend.services import summarizer, transcriber  # noqa: F401  (registers loaders)
+    from backend.services.model_registry import registry
+
+    registry.get("whisper")
+    registry.get("summarizer")
+
+
+def process_file(media_path, output_dir, name):
+    """Transcribe + summarize one file and write all outputs. Runs in a worker."""
+    from backend.services import search_index, summarizer, transcriber, utilities
+
+    started = time.perf_counter()
+    timed = transcriber.transcribe_media_timed(media_path, delete_source=False)
+    transcript = timed.text
+    transcribed = time.perf_counter()
+    try:
+        lecture_id = search_index.index.add_lecture(timed, name)
+    except Exception as e:
+        print(f"Warning: could not index {name} for search ({e})")
+        lecture_id = None
+
+    summary, chunk_summaries = summarizer.summarize_text(transcript)
+    summarized = time.perf_counter()
+
+    transcript_path = output_dir / f"{name}.transcript.txt"
+    with open(transcript_path, "w", encoding="utf-8") as f:
+        f.write(transcript)
+
+    txt_path = utilities.save_summary_to_txt(
+        summary, chunk_summaries, str(media_path),
+        output_dir=str(output_dir), filename=f"{name}.summary.txt",
+    )
+    pdf_path = utilities.save_summary_to_pdf(
+        summary, chunk_summaries, str(media_path),
+        output_dir=str(output_dir), filename=f"{name}.summary.pdf",
+    )
+    if txt_path is None or pdf_path is None:
+        raise RuntimeError("Failed to write summary outputs")
+    transcriber.clear_checkpoints(timed)
+
+    result = {
+        "source": str(media_path),
+        "lecture_id": lecture_id,
+        "transcript_words": len(transcript.split()),
+        "transcribe_seconds": round(transcribed - started, 2),
+        "summarize_seconds": round(summarized - transcribed, 2),
+        "total_seconds": round(time.perf_counter() - started, 2),
+        "outputs": [str(transcript_path), txt_path, pdf_path],
+    }
+
+    # The manifest is written last: its presence marks the file as done.
+    with open(output_dir / f"{name}.json", "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch transcribe and summarize lectures.")
+    parser.add_argument("input_dir", type=Path, help="Directory to scan for media files")
+    parser.add_argument("--output", type=Path, default=PROJECT_ROOT / "batch_output",
+                        help="Where outputs are written (default: batch_output/)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKER_COUNT,
+                        help="Number of worker processes, each loads its own models "
+                             "(default: node profile / BATCH_WORKER_COUNT)")
+    parser.add_argument("--threads", type=int, default=BATCH_INTRA_OP_THREADS,
+                        help="torch threads per worker (default: node profile, else CPUs / workers)")
+    args = parser.parse_args()
+    if args.threads <= 0:
+        # torch's default is every core in every worker, which oversubscribes the CPU.
+        args.threads = max(1, (os.cpu_count() or 1) // max(1, args.workers))
+
+    input_dir = args.input_dir.resolve()
+    if not input_dir.is_dir():
+        print(f"[ERROR] Not a directory: {input_dir}")
+        return 1
+    output_dir = args.output.resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    pending = []
+    skipped = 0
+    for media_path in find_media(input_dir):
+        name = output_name(input_dir, media_path)
+        if (output_dir / f"{name}.json").exists():
+            skipped += 1
+            continue
+        pending.append((media_path, name))
+
+    print(f"Found {len(pending) + skipped} media files ({skipped} already processed)")
+    if not pending:
+        return 0
+
+    print(f"Processing {len(pending)} files with {args.workers} workers x {args.threads} threads...")
+    print("-" * 50)
+
+    started = time.perf_counter()
+    succeeded = []
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=init_worker, initargs=(args.threads,)
+    ) as pool:
+        futures = {
+            pool.submit(process_file, media_path, output_dir, name): media_path
+            for media_path, name in pending
+        }
+        for future in as_completed(futures):
+            media_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[ERROR] {media_path.name}: {e}")
+                continue
+            succeeded.append(result)
+            print(
+                f"[OK] {media_path.name}: {result['total_seconds']:.1f}s "
+                f"(transcribe {result['transcribe_seconds']:.1f}s, "
+                f"summarize {result['summarize_seconds']:.1f}s, "
+                f"{result['transcript_words']} words)"
+            )
+
+    elapsed = time.perf_counter() - started
+    busy = sum(r["total_seconds"] for r in succeeded)
+    words = sum(r["transcript_words"] for r in succeeded)
+
+    print("-" * 50)
+    print(f"Processed {len(succeeded)} files, {failed} failed, {skipped} skipped")
+    print(f"Wall time: {elapsed:.1f}s")
+    if succeeded and elapsed > 0:
+        print(f"Throughput: {len(succeeded) / elapsed * 3600:.1f} files/hour, "
+              f"{words / elapsed:.1f} transcript words/s")
+        print(f"Mean per-file time: {busy / len(succeeded):.1f}s "
+              f"(parallel speedup {busy / elapsed:.2f}x)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Benchmark eager vs accelerated (ACCELERATED_INFERENCE=1) inference per model.
+
+Each mode runs in its own subprocess so the environment flag, compile caches
+and memory are isolated. Warm-up calls (which include torch.compile time) are
+reported separately from the steady-state timings.
+
+Usage:
+    python benchmark_acceleration.py [--runs N] [--warmup N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+SAMPLE_TEXT = (
+    "Today we are going to talk about gradient descent and how it is used to train "
+    "neural networks. The idea is to compute the derivative of the loss with respect "
+    "to every parameter and take a small step in the opposite direction. "
+) * 20
+
+
+def _time_calls(func, warmup, runs):
+    started = time.perf_counter()
+    for _ in range(warmup):
+        func()
+    warmup_seconds = time.perf_counter() - started
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "warmup_seconds": round(warmup_seconds, 2),
+        "median_ms": round(timings[len(timings) // 2] * 1000, 1),
+        "min_ms": round(timings[0] * 1000, 1),
+    }
+
+
+def run_mode(warmup, runs):
+    """Runs inside the child process; prints one JSON line of results."""
+    import numpy as np
+
+    from backend.config import AUDIO_CHUNK_SIZE, DEVICE, TARGET_SAMPLE_RATE
+    from backend.services import acceleration, summarizer, transcriber  # noqa: F401
+    from backend.services.model_registry import registry
+
+    results = {}
+
+    registry.get("summarizer")
+    results["summarizer"] = _time_calls(
+        lambda: summarizer._summarize_chunk(SAMPLE_TEXT), warmup, runs
+    )
+
+    processor, model = registry.get("whisper")
+    t = np.arange(AUDIO_CHUNK_SIZE) / TARGET_SAMPLE_RATE
+    window = (0.1 * np.sin(2 * np.pi * 220 * t)).astype("float32")
+    features = processor(
+        window, sampling_rate=TARGET_SAMPLE_RATE, return_tensors="pt"
+    ).input_features.to(DEVICE)
+
+    def whisper_window():
+        with acceleration.inference_context():
+            acceleration.generate(
+                model, input_features=features, max_new_tokens=400, language="en", task="transcribe"
+            )
+
+    results["whisper"] = _time_calls(whisper_window, warmup, runs)
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare eager and accelerated inference.")
+    parser.add_argument("--runs", type=int, default=5, help="Timed calls per model")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed warm-up calls per model")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_mode(args.warmup, args.runs)
+        return 0
+
+    results = {}
+    for mode, flag in (("eager", "0"), ("accelerated", "1")):
+        print(f"Running {mode} mode...")
+        env = dict(os.environ, ACCELERATED_INFERENCE=flag)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", "--runs", str(args.runs), "--warmup", str(args.warmup)],
+            env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"[ERROR] {mode} run failed:\n{proc.stderr}")
+            return 1
+        results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print("-" * 50)
+    for model in ("summarizer", "whisper"):
+        eager = results["eager"][model]
+        fast = results["accelerated"][model]
+        speedup = eager["median_ms"] / fast["median_ms"] if fast["median_ms"] else 0.0
+        print(
+            f"{model:<11} eager {eager['median_ms']:>8.1f} ms | "
+            f"accelerated {fast['median_ms']:>8.1f} ms | "
+            f"speedup {speedup:.2f}x (warm-up {fast['warmup_seconds']:.1f}s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
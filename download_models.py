@@ -111,6 +111,74 @@ def check_flan_t5_model():
         return False
 
 
+def check_fast_whisper_model():
+    """Check if the fast-tier Whisper (tiny) model exists, download if missing."""
+    whisper_dir = PROJECT_ROOT / "model" / "whisper-tiny"
+    config_file = whisper_dir / "config.json"
+
+    if config_file.exists():
+        print("[OK] Fast-tier Whisper model found")
+        return True
+
+    print("[MISSING] Fast-tier Whisper model not found")
+    print(f"  Location: {whisper_dir}")
+
+    try:
+        from transformers import WhisperProcessor, WhisperForConditionalGeneration
+
+        whisper_dir.mkdir(parents=True, exist_ok=True)
+        model_name = "openai/whisper-tiny"
+
+        print(f"  Downloading {model_name}...")
+        processor = WhisperProcessor.from_pretrained(model_name)
+        model = WhisperForConditionalGeneration.from_pretrained(model_name)
+
+        print(f"  Saving to {whisper_dir}...")
+        processor.save_pretrained(str(whisper_dir))
+        model.save_pretrained(str(whisper_dir))
+
+        print("[OK] Fast-tier Whisper model downloaded successfully!")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] Failed to download fast-tier Whisper model: {e}")
+        return False
+
+
+def check_fast_summarizer():
+    """Check if the fast-tier (distilled BART) summarizer exists, download if missing."""
+    distil_dir = PROJECT_ROOT / "model" / "distilbart-cnn-6-6"
+    config_file = distil_dir / "config.json"
+
+    if config_file.exists():
+        print("[OK] Fast-tier summarizer model found")
+        return True
+
+    print("[MISSING] Fast-tier summarizer model not found")
+    print(f"  Location: {distil_dir}")
+
+    try:
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+        model_name = "sshleifer/distilbart-cnn-6-6"
+        distil_dir.mkdir(parents=True, exist_ok=True)
+
+        print(f"  Downloading {model_name}...")
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+
+        print(f"  Saving model to {distil_dir}...")
+        tokenizer.save_pretrained(str(distil_dir))
+        model.save_pretrained(str(distil_dir))
+
+        print("[OK] Fast-tier summarizer model downloaded successfully!")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] Failed to download fast-tier summarizer model: {e}")
+        return False
+
+
 if __name__ == "__main__":
     print("Checking all required models...")
     print("-" * 50)
@@ -119,8 +187,15 @@ if __name__ == "__main__":
     fine_tuned_ok = check_fine_tuned_summarizer()
     flan_ok = check_flan_t5_model()
 
+    # Optional smaller models, used under load (see "Degrade mode" in README).
+    fast_ok = True
+    if "--fast" in sys.argv:
+        fast_whisper_ok = check_fast_whisper_model()
+        fast_summarizer_ok = check_fast_summarizer()
+        fast_ok = fast_whisper_ok and fast_summarizer_ok
+
     print("-" * 50)
-    if whisper_ok and fine_tuned_ok and flan_ok:
+    if whisper_ok and fine_tuned_ok and flan_ok and fast_ok:
         print("[OK] All models are ready!")
     else:
         print("[WARNING] Some models are missing. Please check the logs above.")
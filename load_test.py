@@ -0,0 +1,443 @@
+"""
+Concurrent load test for the API with optional stand-in models.
+
+Drives the FastAPI app with a weighted mix of /api/summarize-text,
+/api/transcribe-and-summarize and /api/download-pdf requests and reports
+p50/p95/p99 latency, throughput and error rate per endpoint.
+
+By default the app runs in this process (ASGI transport, no sockets) with
+the summarizer and Whisper replaced by deterministic stand-ins that sleep
+for a configurable time per call, so scheduling, admission and event-loop
+behaviour can be measured without GPUs, model files or network. The real
+request path (registry, scheduler, checkpoints, chapters, search index, PDF
+pool) is unchanged; only the model calls are faked.
+
+Usage:
+    python load_test.py [--requests N | --duration S] [--concurrency N] [--rate R]
+                        [--mix summarize=6,media=1,pdf=3] [--uvicorn | --url URL]
+                        [--real-models] [--json FILE]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import wave
+import zlib
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+ENDPOINTS = ("summarize", "media", "pdf")
+
+VOCABULARY = (
+    "gradient descent loss function weights network layer neuron activation "
+    "training data model error learning rate optimization parameter matrix vector "
+    "probability distribution sample variance estimate regression classification "
+    "feature kernel memory process thread schedule algorithm complexity proof"
+).split()
+
+
+# ---------------------------------------------------------------- stand-in models
+
+class _Batch(dict):
+    """Tokenizer / feature-extractor output; ``.to(device)`` is a no-op."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def to(self, _device):
+        return self
+
+
+def _sentences(seed, words):
+    rng = random.Random(seed)
+    out, sentence = [], []
+    for _ in range(words):
+        sentence.append(rng.choice(VOCABULARY))
+        if len(sentence) >= rng.randint(8, 16):
+            out.append(" ".join(sentence).capitalize() + ".")
+            sentence = []
+    if sentence:
+        out.append(" ".join(sentence).capitalize() + ".")
+    return " ".join(out)
+
+
+def _sleep_for(per_item_ms, items):
+    # Half of the cost is fixed per call and half per item, so batching pays
+    # off roughly the way it does on real hardware.
+    time.sleep(per_item_ms / 1000 * (0.5 + 0.5 * items))
+
+
+class FakeSummarizerTokenizer:
+    def __call__(self, texts, return_tensors=None, truncation=True, max_length=1024, **_):
+        if isinstance(texts, str):
+            texts = [texts]
+        if return_tensors is None:
+            # acceleration.padding_kwargs() only looks at the token counts.
+            return {"input_ids": [[0] * min(len(t.split()), max_length) for t in texts]}
+        return _Batch(input_ids=list(texts), attention_mask=None)
+
+    def batch_decode(self, ids, skip_special_tokens=True):
+        return [_sentences(zlib.crc32(text.encode("utf-8")), 60) for text in ids]
+
+
+class FakeSummarizerModel:
+    def __init__(self, latency_ms):
+        self.latency_ms = latency_ms
+
+    def generate(self, input_ids, **_):
+        _sleep_for(self.latency_ms, len(input_ids))
+        return input_ids
+
+
+class FakeWhisperProcessor:
+    def __call__(self, chunks, sampling_rate, return_tensors=None, **_):
+        return _Batch(input_features=_Batch(chunks=list(chunks), sample_rate=sampling_rate))
+
+    def batch_decode(self, pred_ids, skip_special_tokens=True, output_offsets=False):
+        decoded = []
+        for chunk in pred_ids.chunks:
+            seconds = len(chunk) / pred_ids.sample_rate
+            half = round(seconds / 2, 2)
+            # Text depends on the audio, so distinct uploads never share
+            # transcript or summary checkpoints.
+            seed = zlib.crc32(chunk.tobytes())
+            first = _sentences(seed, max(1, int(half * 2.5)))
+            second = _sentences(seed + 1, max(1, int(half * 2.5)))
+            item = {"text": f" {first} {second}"}
+            if output_offsets:
+                item["offsets"] = [
+                    {"text": f" {first}", "timestamp": (0.0, half)},
+                    {"text": f" {second}", "timestamp": (half, round(seconds, 2))},
+                ]
+            decoded.append(item)
+        return decoded
+
+
+class FakeWhisperModel:
+    def __init__(self, latency_ms):
+        self.latency_ms = latency_ms
+
+    def generate(self, input_features, **_):
+        _sleep_for(self.latency_ms, len(input_features.chunks))
+        return input_features
+
+
+def install_fake_models(summary_ms, whisper_ms, fast_speedup=0):
+    """
+    Swap the registry loaders for stand-ins (the app must be imported first).
+    The fast tier always gets stand-ins too, ``fast_speedup`` times quicker
+    (0: as fast as the full ones), so a stand-in run never loads the real
+    fast models that may be installed.
+    """
+    from backend.services import summarizer, tiers
+    from backend.services.model_registry import registry
+
+    speedup = fast_speedup if fast_speedup > 0 else 1
+    registry.register("summarizer", lambda: (FakeSummarizerTokenizer(), FakeSummarizerModel(summary_ms)))
+    registry.register("whisper", lambda: (FakeWhisperProcessor(), FakeWhisperModel(whisper_ms)))
+    tiers.register_fast(
+        "summarizer", lambda: (FakeSummarizerTokenizer(), FakeSummarizerModel(summary_ms / speedup)), None
+    )
+    tiers.register_fast(
+        "whisper", lambda: (FakeWhisperProcessor(), FakeWhisperModel(whisper_ms / speedup)), None
+    )
+    # Short texts go through the external paraphrasing API; keep runs offline.
+    summarizer.paraphrase_text = lambda text: text
+
+
+# ---------------------------------------------------------------- payloads
+
+def synthetic_wav(seconds, seed, sample_rate=16_000):
+    """A mono 16-bit WAV: a tone plus seeded noise, unique per seed."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    signal = 0.2 * np.sin(2 * np.pi * 220 * t) + 0.02 * rng.standard_normal(len(t))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes((signal * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def build_request(endpoint, seq, args):
+    """(method, path, request kwargs) for the ``seq``-th request."""
+    if endpoint == "summarize":
+        return "POST", "/api/summarize-text", {"json": {"text": _sentences(seq, args.text_words)}}
+    if endpoint == "media":
+        wav = synthetic_wav(args.audio_seconds, seq)
+        return "POST", "/api/transcribe-and-summarize", {
+            "files": {"file": (f"load-{seq}.wav", wav, "audio/wav")},
+        }
+    # A small set of documents, so the PDF cache hit rate shows up too.
+    variant = seq % args.pdf_variants
+    return "POST", "/api/download-pdf", {"json": {
+        "text": _sentences(variant, 150),
+        "chunks": [_sentences(variant * 100 + i, 60) for i in range(5)],
+        "filename": f"summary-{variant}.pdf",
+    }}
+
+
+def parse_mix(value):
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return weights
+
+
+# ---------------------------------------------------------------- driver
+
+async def run_load(client, args):
+    rng = random.Random(args.seed)
+    names = list(args.mix)
+    weights = [args.mix[n] for n in names]
+    samples = {name: [] for name in names}
+    errors = {name: {} for name in names}
+    tiers_served = {name: {} for name in names}
+    counter = iter(range(sys.maxsize))
+    started = time.perf_counter()
+    deadline = started + args.duration if args.duration else None
+
+    def more():
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return sum(len(s) for s in samples.values()) + in_flight[0] < args.requests
+
+    async def send(endpoint, seq, client_id, scheduled):
+        method, path, kwargs = build_request(endpoint, seq, args)
+        try:
+            response = await client.request(
+                method, path, headers={"X-Client-Id": client_id}, timeout=args.timeout, **kwargs
+            )
+            outcome = None if response.status_code < 400 else str(response.status_code)
+            if outcome is None and endpoint != "pdf":
+                tier = response.json().get("tier", {}).get("tier", "unknown")
+                tiers_served[endpoint][tier] = tiers_served[endpoint].get(tier, 0) + 1
+        except Exception as e:
+            outcome = type(e).__name__
+        # Latency counts from when the request was due, so queueing in an
+        # overloaded open-loop run isn't hidden (no coordinated omission).
+        samples[endpoint].append(time.perf_counter() - scheduled)
+        if outcome is not None:
+            errors[endpoint][outcome] = errors[endpoint].get(outcome, 0) + 1
+
+    in_flight = [0]
+
+    async def tracked(endpoint, seq, client_id, scheduled):
+        try:
+            await send(endpoint, seq, client_id, scheduled)
+        finally:
+            in_flight[0] -= 1
+
+    if args.rate:
+        # Open loop: Poisson arrivals at --rate, capped at --concurrency in flight.
+        limit = asyncio.Semaphore(args.concurrency)
+        tasks = []
+        next_at = time.perf_counter()
+        while more():
+            next_at += rng.expovariate(args.rate)
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            seq = next(counter)
+            endpoint = rng.choices(names, weights)[0]
+            in_flight[0] += 1
+
+            async def limited(endpoint=endpoint, seq=seq, scheduled=next_at):
+                async with limit:
+                    await tracked(endpoint, seq, f"load-{seq % args.clients}", scheduled)
+
+            tasks.append(asyncio.create_task(limited()))
+        await asyncio.gather(*tasks)
+    else:
+        # Closed loop: --concurrency virtual users, each sending back to back.
+        async def user(index):
+            while more():
+                seq = next(counter)
+                in_flight[0] += 1
+                endpoint = rng.choices(names, weights)[0]
+                await tracked(endpoint, seq, f"load-{index % args.clients}", time.perf_counter())
+
+        await asyncio.gather(*(user(i) for i in range(args.concurrency)))
+
+    return samples, errors, tiers_served, time.perf_counter() - started
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile.
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_results(samples, errors, tiers_served, wall):
+    report = {}
+    for endpoint, latencies in samples.items():
+        if not latencies:
+            continue
+        latencies = sorted(latencies)
+        failed = sum(errors[endpoint].values())
+        report[endpoint] = {
+            "requests": len(latencies),
+            "errors": failed,
+            "error_rate": round(failed / len(latencies), 4),
+            "error_kinds": errors[endpoint],
+            "tiers": tiers_served[endpoint],
+            "throughput_rps": round(len(latencies) / wall, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "max_ms": round(latencies[-1] * 1000, 1),
+        }
+    return report
+
+
+def print_report(report, wall):
+    header = f"{'endpoint':<10} {'reqs':>6} {'err%':>6} {'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, r in report.items():
+        print(
+            f"{endpoint:<10} {r['requests']:>6} {r['error_rate'] * 100:>5.1f}% {r['throughput_rps']:>7.2f} "
+            f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}"
+        )
+        if r["error_kinds"]:
+            print(f"{'':<10} errors: {r['error_kinds']}")
+        if len(r["tiers"]) > 1 or "fast" in r["tiers"]:
+            print(f"{'':<10} model tiers: {r['tiers']}")
+    total = sum(r["requests"] for r in report.values())
+    print("-" * len(header))
+    print(f"{total} requests in {wall:.1f}s ({total / wall:.2f} req/s overall)")
+
+
+# ---------------------------------------------------------------- targets
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_uvicorn(app):
+    """Serve ``app`` from a background thread; returns (base_url, server)."""
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server
+
+
+async def main_async(args):
+    import httpx
+
+    server = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url.rstrip("/"))
+        target = args.url
+    else:
+        from backend.main import app
+        from backend.services import pdf_renderer
+
+        if not args.real_models:
+            install_fake_models(args.fake_summary_ms, args.fake_whisper_ms, args.fake_fast_speedup)
+        if args.uvicorn:
+            base_url, server = start_uvicorn(app)
+            client = httpx.AsyncClient(base_url=base_url, limits=httpx.Limits(max_connections=None))
+            target = f"uvicorn at {base_url}"
+        else:
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test")
+            target = "in-process ASGI app"
+        target += " with real models" if args.real_models else " with stand-in models"
+
+    budget = f"{args.duration}s" if args.duration else f"{args.requests} requests"
+    mode = f"open loop at {args.rate} req/s" if args.rate else "closed loop"
+    print(f"Load test against {target}: {budget}, {mode}, concurrency {args.concurrency}, mix {args.mix}")
+    print("-" * 50)
+
+    try:
+        async with client:
+            samples, errors, tiers_served, wall = await run_load(client, args)
+    finally:
+        if server is not None:
+            server.should_exit = True
+        if not args.url:
+            pdf_renderer.renderer.shutdown()
+
+    report = summarize_results(samples, errors, tiers_served, wall)
+    print_report(report, wall)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"target": target, "mix": args.mix, "wall_seconds": round(wall, 2), "endpoints": report}, f, indent=2)
+        print(f"Report written to {args.json}")
+    return 1 if any(r["errors"] for r in report.values()) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the summarizer API.")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=0, help="Run for this many seconds instead")
+    parser.add_argument("--concurrency", type=int, default=16, help="Virtual users, or max in flight with --rate")
+    parser.add_argument("--rate", type=float, default=0, help="Open-loop arrival rate in req/s (default: closed loop)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("summarize=6,media=1,pdf=3"),
+                        help="Endpoint weights, e.g. summarize=6,media=1,pdf=3")
+    parser.add_argument("--clients", type=int, default=4, help="Distinct X-Client-Id values to spread load over")
+    parser.add_argument("--text-words", type=int, default=1200, help="Words per summarize-text request")
+    parser.add_argument("--audio-seconds", type=float, default=10, help="Length of each synthetic WAV upload")
+    parser.add_argument("--pdf-variants", type=int, default=8, help="Distinct PDF documents to cycle through")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--uvicorn", action="store_true", help="Serve the app over local HTTP instead of in-process ASGI")
+    target.add_argument("--url", help="Test an already running server (its models are used as-is)")
+    parser.add_argument("--real-models", action="store_true", help="Use the real models instead of stand-ins")
+    parser.add_argument("--fake-summary-ms", type=float, default=400, help="Stand-in summarizer time per chunk")
+    parser.add_argument("--fake-whisper-ms", type=float, default=150, help="Stand-in Whisper time per window")
+    parser.add_argument("--fake-fast-speedup", type=float, default=0,
+                        help="Fast-tier stand-ins are this many times quicker (0 = same speed)")
+    parser.add_argument("--json", type=Path, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        print("[ERROR] httpx is required: pip install httpx")
+        return 1
+
+    if not args.url and not args.real_models:
+        # Keep stand-in transcripts and summaries out of the real checkpoint
+        # store and search index.
+        scratch = Path(tempfile.mkdtemp(prefix="load_test_"))
+        os.environ.setdefault("CHECKPOINT_DIR", str(scratch / "checkpoints"))
+        os.environ.setdefault("SEARCH_INDEX_PATH", str(scratch / "search_index.sqlite3"))
+
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
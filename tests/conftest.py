@@ -0,0 +1,18 @@
+"""
+Shared test setup.
+
+Everything the backend writes (checkpoints, search index, node profile) is
+pointed at a throwaway directory before ``backend.config`` is first imported.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+_STATE_DIR = Path(tempfile.mkdtemp(prefix="lecture-summarizer-tests-"))
+os.environ.setdefault("CHECKPOINT_DIR", str(_STATE_DIR / "checkpoints"))
+os.environ.setdefault("SEARCH_INDEX_PATH", str(_STATE_DIR / "search_index.sqlite3"))
+os.environ.setdefault("NODE_PROFILE_PATH", str(_STATE_DIR / "node_profile.json"))
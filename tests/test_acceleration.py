@@ -0,0 +1,77 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import acceleration
+
+
+class _Model:
+    """Fails while its encoder is the "compiled" one, like a broken torch.compile."""
+
+    def __init__(self, compiled=True):
+        eager = SimpleNamespace(encoder="eager-encoder", decoder="eager-decoder")
+        self.model = SimpleNamespace(encoder="eager-encoder", decoder="eager-decoder")
+        if compiled:
+            self._eager_modules = (eager.encoder, eager.decoder)
+            self.model.encoder = "compiled-encoder"
+            self.model.decoder = "compiled-decoder"
+        self.calls = 0
+
+    def generate(self, **kwargs):
+        self.calls += 1
+        if self.model.encoder == "compiled-encoder":
+            raise RuntimeError("compilation failed")
+        return kwargs["input_ids"]
+
+
+def test_failed_compiled_generate_falls_back_to_eager():
+    model = _Model()
+    assert acceleration.generate(model, input_ids=[1, 2]) == [1, 2]
+    assert model.model.encoder == "eager-encoder"
+    assert model.model.decoder == "eager-decoder"
+    assert not hasattr(model, "_eager_modules")
+    assert model.calls == 2
+
+
+def test_eager_failures_are_not_retried():
+    model = _Model(compiled=False)
+    model.model.encoder = "compiled-encoder"  # fails, but was never compiled by us
+    with pytest.raises(RuntimeError, match="compilation failed"):
+        acceleration.generate(model, input_ids=[1])
+    assert model.calls == 1
+
+
+def test_concurrent_failures_restore_eager_once(capsys):
+    model = _Model()
+    barrier = threading.Barrier(4)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(acceleration.generate(model, input_ids=[7]))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [[7]] * 4
+    assert model.model.encoder == "eager-encoder"
+    assert capsys.readouterr().out.count("falling back to eager") == 1
+
+
+def test_padding_uses_token_buckets_only_when_accelerated(monkeypatch):
+    def tokenizer(texts, truncation, max_length):
+        return {"input_ids": [list(range(min(len(t.split()), max_length))) for t in texts]}
+
+    text = " ".join(["word"] * 200)
+    assert acceleration.padding_kwargs(tokenizer, text, 1024) == {"padding": "longest", "max_length": 1024}
+
+    monkeypatch.setattr(acceleration, "ACCELERATED_INFERENCE", True)
+    assert acceleration.padding_kwargs(tokenizer, [text, "short"], 1024) == {
+        "padding": "max_length",
+        "max_length": 256,
+    }
+    assert acceleration.padding_kwargs(tokenizer, text, 150) == {"padding": "max_length", "max_length": 150}
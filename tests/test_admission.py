@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from backend.services.admission import AdmissionController, AdmissionRejected, MediaEstimate
+
+
+def _estimate(memory=100, processing=10.0, duration=60.0):
+    return MediaEstimate(
+        duration_seconds=duration,
+        estimated_memory_bytes=memory,
+        estimated_processing_seconds=processing,
+    )
+
+
+def _controller(**kwargs):
+    options = dict(memory_budget=1000, processing_budget=100, max_duration=3600, max_queue=2, queue_timeout=5)
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+def test_admits_jobs_that_fit_and_releases_them():
+    controller = _controller()
+
+    async def run():
+        async with controller.admit(_estimate(memory=400)):
+            async with controller.admit(_estimate(memory=400)):
+                assert controller.memory_in_use == 800
+                assert controller.processing_in_flight == 20
+        assert controller.memory_in_use == 0
+        assert controller.processing_in_flight == 0
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "estimate",
+    [_estimate(duration=7200), _estimate(memory=2000)],
+    ids=["too-long", "too-much-memory"],
+)
+def test_rejects_jobs_over_the_hard_limits(estimate):
+    controller = _controller()
+
+    async def run():
+        async with controller.admit(estimate):
+            pass
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.status_code == 413
+
+
+def test_idle_node_admits_a_job_over_the_processing_budget():
+    controller = _controller()
+
+    async def run():
+        async with controller.admit(_estimate(processing=500)) as estimate:
+            assert estimate.queued_seconds == 0
+
+    asyncio.run(run())
+
+
+def test_queued_jobs_are_admitted_in_arrival_order():
+    controller = _controller()
+    order = []
+
+    async def job(name, memory, hold):
+        async with controller.admit(_estimate(memory=memory)):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def run():
+        running = asyncio.create_task(job("running", 900, 0.05))
+        await asyncio.sleep(0)
+        # "big" is first in line; "small" would fit sooner but must not overtake it.
+        big = asyncio.create_task(job("big", 800, 0))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(job("small", 50, 0))
+        await asyncio.sleep(0)
+        assert controller.stats()["queued"] == 2
+        await asyncio.gather(running, big, small)
+
+    asyncio.run(run())
+    assert order == ["running", "big", "small"]
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    controller = _controller(max_queue=1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit(_estimate(memory=900)):
+                await release.wait()
+
+        async def wait():
+            async with controller.admit(_estimate(memory=900)):
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(wait())
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(AdmissionRejected) as excinfo:
+                async with controller.admit(_estimate(memory=900)):
+                    pass
+        finally:
+            release.set()
+            await asyncio.gather(holder, waiter)
+        return excinfo.value
+
+    rejected = asyncio.run(run())
+    assert rejected.status_code == 503
+    assert rejected.retry_after > 0
+
+
+def test_queue_timeout_is_rejected_and_leaves_the_queue():
+    controller = _controller(queue_timeout=0.05)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit(_estimate(memory=900)):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(AdmissionRejected) as excinfo:
+                async with controller.admit(_estimate(memory=900)):
+                    pass
+            assert controller.stats()["queued"] == 0
+        finally:
+            release.set()
+            await holder
+        return excinfo.value
+
+    assert asyncio.run(run()).status_code == 503
@@ -0,0 +1,53 @@
+import autotune
+
+GB = 1024 ** 3
+
+
+def _metrics(throughput, latency, memory, baseline=GB):
+    return {"throughput": throughput, "latency": latency, "memory_bytes": memory, "baseline_bytes": baseline}
+
+
+RESULTS = {
+    "summarizer": {1: _metrics(2.0, 1.0, 2 * GB), 4: _metrics(6.0, 3.0, 6 * GB)},
+    "transcriber": {1: _metrics(3.0, 0.5, GB), 4: _metrics(5.0, 1.5, 3 * GB)},
+}
+
+
+def test_footprint_counts_one_baseline_and_every_model_per_worker():
+    metrics = {"summarizer": RESULTS["summarizer"][1], "transcriber": RESULTS["transcriber"][4]}
+    assert autotune.footprint(2, metrics) == 2 * (GB + 2 * GB + 3 * GB)
+
+
+def test_largest_batches_win_throughput_without_a_cap():
+    best, best_score = autotune.choose_batches(RESULTS, "throughput", memory_cap=0, workers=1)
+    assert {model: batch for model, (batch, _) in best.items()} == {"summarizer": 4, "transcriber": 4}
+    assert best_score == 30.0
+
+
+def test_memory_cap_limits_the_batches_together():
+    # 1 + 6 + 3 = 10 GB does not fit; 1 + 6 + 1 = 8 GB does.
+    best, _ = autotune.choose_batches(RESULTS, "throughput", memory_cap=9 * GB, workers=1)
+    assert {model: batch for model, (batch, _) in best.items()} == {"summarizer": 4, "transcriber": 1}
+
+    # Two workers need twice the memory, so only the smallest batches fit.
+    best, _ = autotune.choose_batches(RESULTS, "throughput", memory_cap=9 * GB, workers=2)
+    assert {model: batch for model, (batch, _) in best.items()} == {"summarizer": 1, "transcriber": 1}
+
+    assert autotune.choose_batches(RESULTS, "throughput", memory_cap=GB, workers=1) == (None, None)
+
+
+def test_latency_objective_prefers_small_batches():
+    best, _ = autotune.choose_batches(RESULTS, "latency", memory_cap=0, workers=1)
+    assert {model: batch for model, (batch, _) in best.items()} == {"summarizer": 1, "transcriber": 1}
+
+
+def test_latency_tuning_uses_one_worker():
+    assert autotune.candidate_pools(6, "latency") == [(1, 1), (1, 2), (1, 4), (1, 6)]
+    assert all(w * t <= 6 for w, t in autotune.candidate_pools(6, "throughput"))
+
+
+def test_pools_that_cannot_fit_are_known_before_they_start():
+    # Single-worker footprints: 1 + 2 + 1 = 4 GB at the smallest batches.
+    assert autotune.fitting_batches(RESULTS, 9 * GB, workers=1) == {"summarizer": (1, 4), "transcriber": (1, 4)}
+    assert autotune.fitting_batches(RESULTS, 9 * GB, workers=2) == {"summarizer": (1,), "transcriber": (1,)}
+    assert autotune.fitting_batches(RESULTS, 9 * GB, workers=4) == {"summarizer": (), "transcriber": ()}
@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+
+from backend.services import checkpoints
+
+
+def test_windows_round_trip_and_resume(tmp_path):
+    store = checkpoints.CheckpointStore("transcript-test", "abc", root=tmp_path)
+    assert store.load_all() == {}
+
+    store.save(0, [[0.0, 1.5, "hello"]])
+    store.save(2, "third window")
+
+    # A retried job with the same key sees the finished windows.
+    again = checkpoints.CheckpointStore("transcript-test", "abc", root=tmp_path)
+    assert again.load_all() == {0: [[0.0, 1.5, "hello"]], 2: "third window"}
+    assert again.load(1) is None
+
+
+def test_corrupt_window_is_recomputed(tmp_path):
+    store = checkpoints.CheckpointStore("ns", "key", root=tmp_path)
+    store.save(0, "ok")
+    (store.directory / "000001.json").write_text("{not json", encoding="utf-8")
+
+    assert store.load_all() == {0: "ok"}
+
+
+def test_concurrent_jobs_with_the_same_content_can_save_and_clear(tmp_path):
+    errors = []
+
+    def work(clear):
+        store = checkpoints.CheckpointStore("ns", "same-text", root=tmp_path)
+        try:
+            for i in range(300):
+                store.save(0, f"window {i}")
+                if clear and i % 10 == 0:
+                    store.clear()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(n == 0,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    store = checkpoints.CheckpointStore("ns", "same-text", root=tmp_path)
+    assert not list(store.directory.glob("*.tmp"))
+    store.save(1, "after")
+    assert store.load(1) == "after"
+
+
+def test_clear_removes_only_that_job(tmp_path):
+    first = checkpoints.CheckpointStore("ns", "first", root=tmp_path)
+    second = checkpoints.CheckpointStore("ns", "second", root=tmp_path)
+    first.save(0, "a")
+    second.save(0, "b")
+
+    first.clear()
+
+    assert first.load_all() == {}
+    assert second.load_all() == {0: "b"}
+
+
+def test_prune_stale_drops_only_old_jobs(tmp_path):
+    old = checkpoints.CheckpointStore("ns", "old", root=tmp_path)
+    fresh = checkpoints.CheckpointStore("ns", "fresh", root=tmp_path)
+    old.save(0, "a")
+    fresh.save(0, "b")
+    an_hour_ago = time.time() - 3600
+    os.utime(old.directory, (an_hour_ago, an_hour_ago))
+
+    checkpoints.prune_stale(max_age=60, root=tmp_path)
+
+    assert not old.directory.exists()
+    assert fresh.load_all() == {0: "b"}
+
+
+def test_hashes_are_content_based(tmp_path):
+    path = tmp_path / "audio.bin"
+    path.write_bytes(b"\x00\x01" * 1000)
+
+    assert checkpoints.hash_file(path) == checkpoints.hash_file(path)
+    assert checkpoints.hash_text("a") != checkpoints.hash_text("b")
@@ -0,0 +1,87 @@
+import pytest
+
+from backend.services import scheduler, tiers
+from backend.services.degrade import DegradeController
+from backend.services.tiers import FAST, FULL
+
+
+@pytest.fixture
+def fast_models(monkeypatch, tmp_path):
+    monkeypatch.setattr(tiers, "_fast_models", set())
+    tiers.register_fast("summarizer-test", lambda: object(), None)
+    tiers.register_fast("whisper-test", lambda: object(), tmp_path / "not-installed")
+    return tiers.fast_models()
+
+
+def test_fast_variant_is_used_only_when_installed(fast_models):
+    assert fast_models == ["summarizer-test"]
+    assert tiers.model_name("summarizer-test") == "summarizer-test"
+    with tiers.request_tier(FAST):
+        assert tiers.model_name("summarizer-test") == "summarizer-test:fast"
+        assert tiers.model_name("whisper-test") == "whisper-test"
+        assert tiers.checkpoint_suffix("summarizer-test") == "-fast"
+        assert tiers.checkpoint_suffix("whisper-test") == ""
+
+
+def test_response_reports_the_tier_actually_served(fast_models):
+    with tiers.request_tier(FAST) as annotation:
+        tiers.model_name("summarizer-test")
+        tiers.model_name("whisper-test")
+    assert annotation == {"tier": FAST, "models": ["summarizer-test:fast", "whisper-test"]}
+
+    with tiers.request_tier(FAST) as annotation:
+        tiers.model_name("whisper-test")
+    assert annotation == {"tier": FULL, "models": ["whisper-test"]}
+    # Outside a request nothing is recorded and the full tier applies.
+    assert tiers.model_name("summarizer-test") == "summarizer-test"
+
+
+def _controller(monkeypatch, depth, **kwargs):
+    options = dict(mode="auto", queue_depth=6, wait_slo=5.0, min_seconds=0.0)
+    options.update(kwargs)
+    controller = DegradeController(**options)
+    monkeypatch.setattr(controller, "_queue_depth", lambda: depth[0])
+    return controller
+
+
+def test_queue_depth_switches_with_hysteresis(monkeypatch):
+    depth = [0]
+    controller = _controller(monkeypatch, depth)
+    assert controller.choose() == FULL
+
+    depth[0] = 6
+    assert controller.choose() == FAST
+    depth[0] = 4  # below the threshold, but not below half of it
+    assert controller.choose() == FAST
+    depth[0] = 3
+    assert controller.choose() == FULL
+    assert controller.stats()["switches"] == 2
+
+
+def test_minimum_dwell_time_in_degraded_mode(monkeypatch):
+    depth = [10]
+    controller = _controller(monkeypatch, depth, min_seconds=3600)
+    assert controller.choose() == FAST
+    depth[0] = 0
+    assert controller.choose() == FAST
+
+
+def test_slow_inference_slots_trigger_degrade_mode(monkeypatch):
+    controller = _controller(monkeypatch, [0])
+    for _ in range(20):
+        controller.observe_wait(scheduler.INTERACTIVE, 30.0)
+    assert controller.choose() == FAST
+
+
+def test_batch_waits_are_ignored(monkeypatch):
+    controller = _controller(monkeypatch, [0])
+    for _ in range(20):
+        controller.observe_wait(scheduler.BATCH, 30.0)
+    assert controller.choose() == FULL
+
+
+@pytest.mark.parametrize("mode, tier", [("off", FULL), ("always", FAST)])
+def test_mode_overrides_the_load_signals(monkeypatch, mode, tier):
+    controller = _controller(monkeypatch, [100], mode=mode)
+    assert controller.choose() == tier
+    assert controller.stats()["tier"] == tier
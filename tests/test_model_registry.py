@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from backend.services.model_registry import ModelRegistry
+
+
+class _Model:
+    """Stands in for a loaded model; not a torch module, so its size is the estimate."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+def _registry(budget=1000, ttl=3600, **models):
+    registry = ModelRegistry(budget, ttl)
+    loads = {name: 0 for name in models}
+    for name, size in models.items():
+        def loader(name=name):
+            loads[name] += 1
+            return _Model(name)
+
+        registry.register(name, loader, estimated_bytes=size)
+    return registry, loads
+
+
+def _loaded(registry):
+    return {name for name, info in registry.stats()["models"].items() if info["loaded"]}
+
+
+def test_models_load_once_and_are_reused():
+    registry, loads = _registry(summarizer=400)
+    with registry.use("summarizer") as first:
+        pass
+    assert registry.get("summarizer") is first
+    assert loads == {"summarizer": 1}
+    assert registry.stats()["loaded_bytes"] == 400
+
+
+def test_least_recently_used_idle_model_is_evicted_for_budget():
+    registry, loads = _registry(a=400, b=400, c=400)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b is now the least recently used
+    registry.get("c")
+
+    assert _loaded(registry) == {"a", "c"}
+    assert registry.stats()["loaded_bytes"] <= 1000
+    assert [(e["event"], e["model"], e.get("reason")) for e in registry.stats()["events"]][-2:] == [
+        ("evict", "b", "budget"),
+        ("load", "c", None),
+    ]
+
+    registry.get("b")
+    assert loads == {"a": 1, "b": 2, "c": 1}
+
+
+def test_models_in_use_are_never_evicted():
+    registry, _ = _registry(a=600, b=600)
+    with registry.use("a"):
+        registry.get("b")  # over budget, but a is pinned
+        assert _loaded(registry) == {"a", "b"}
+        assert registry.evict("a") is False
+    assert registry.stats()["models"]["a"]["refcount"] == 0
+    assert registry.evict("a") is True
+    assert _loaded(registry) == {"b"}
+
+
+def test_idle_models_are_evicted_after_the_ttl():
+    registry, loads = _registry(ttl=0.05, a=100, b=100)
+    registry.get("a")
+    with registry.use("b"):
+        time.sleep(0.1)
+        registry.evict_idle()
+        assert _loaded(registry) == {"b"}
+    registry.get("a")
+    assert loads["a"] == 2
+
+
+def test_registering_again_replaces_an_idle_model():
+    registry, loads = _registry(a=100)
+    registry.get("a")
+    registry.register("a", lambda: _Model("new"), estimated_bytes=100)
+    assert registry.get("a").name == "new"
+    assert loads["a"] == 1
+
+
+def test_unknown_model_is_an_error():
+    registry, _ = _registry()
+    with pytest.raises(RuntimeError, match="not registered"):
+        registry.get("missing")
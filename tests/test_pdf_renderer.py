@@ -0,0 +1,73 @@
+import asyncio
+import re
+
+import pytest
+
+from backend.services import pdf_layout
+from backend.services.pdf_layout import make_document
+from backend.services.pdf_renderer import PDFRenderer, document_key
+
+
+@pytest.fixture
+def renderer():
+    renderer = PDFRenderer(workers=1, max_bytes=1024 ** 2, font_path=None)
+    yield renderer
+    renderer.shutdown()
+
+
+def test_document_key_depends_on_content_and_font():
+    document = make_document("Summary.", ["Notes"], title="Lecture")
+    assert document_key(document, None) == document_key(make_document(" Summary. ", ["Notes", " "], "Lecture"), None)
+    assert document_key(document, None) != document_key(make_document("Other.", ["Notes"], "Lecture"), None)
+    assert document_key(document, None) != document_key(document, "/fonts/DejaVuSans.ttf")
+
+
+def test_concurrent_requests_share_one_render_and_repeats_hit_the_cache(renderer):
+    document = make_document("Gradient descent, in brief. Ünïcödé is replaced.", ["First chunk."], title="Week 3")
+
+    async def run():
+        first, second = await asyncio.gather(renderer.render(document), renderer.render(document))
+        third = await renderer.render(document)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first.startswith(b"%PDF")
+    assert first == second == third
+    stats = renderer.stats()
+    assert (stats["misses"], stats["hits"], stats["cached"], stats["in_flight"]) == (1, 1, 1, 0)
+    assert stats["unicode_font"] is False
+
+
+def test_cache_evicts_least_recently_used(renderer):
+    renderer.max_bytes = 0
+    renderer._store("a", b"x" * 10)
+    assert renderer.stats()["cached"] == 0  # larger than the whole cache
+
+    renderer.max_bytes = 25
+    renderer._store("a", b"x" * 10)
+    renderer._store("b", b"x" * 10)
+    renderer._cache.move_to_end("a")
+    renderer._store("c", b"x" * 10)
+    assert list(renderer._cache) == ["a", "c"]
+    assert renderer.stats()["cached_bytes"] == 20
+
+
+def _without_timestamps(pdf):
+    return re.sub(rb"/CreationDate \(D:[^)]*\)|/ID \[<[0-9A-F]+><[0-9A-F]+>\]", b"", pdf)
+
+
+def test_reused_font_renders_the_same_pdf(monkeypatch):
+    fonts = pdf_layout.resolve_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+    if fonts is None:
+        pytest.skip("DejaVu Sans is not installed")
+    monkeypatch.setattr(pdf_layout, "_parsed_fonts", {})
+    first = make_document("Résumé: ∑ of gradients", ["Ωmega"], title="First")
+    second = make_document("Second lecture — ψ waves, «quoted»", ["More notes"], title="Second")
+
+    fresh = pdf_layout.render_document(second, fonts[0])
+    monkeypatch.setattr(pdf_layout, "_parsed_fonts", {})
+    pdf_layout.render_document(first, fonts[0])
+    assert set(pdf_layout._parsed_fonts) == {(fonts[0], ""), (fonts[1], "B")}
+    reused = pdf_layout.render_document(second, fonts[0])
+
+    assert _without_timestamps(reused) == _without_timestamps(fresh)
@@ -0,0 +1,158 @@
+import threading
+import time
+
+import pytest
+
+from backend.services.scheduler import (
+    BATCH,
+    INTERACTIVE,
+    MEDIA,
+    InferenceScheduler,
+    SchedulerBusy,
+)
+
+
+def _scheduler(**kwargs):
+    options = dict(aging_seconds=0, max_waiting_jobs=8)
+    options.update(kwargs)
+    return InferenceScheduler(1, {INTERACTIVE: 4, MEDIA: 4, BATCH: 4}, **options)
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for the scheduler"
+        time.sleep(0.005)
+
+
+def _steps_waiting(scheduler):
+    return sum(s["steps_waiting"] for s in scheduler.stats().values())
+
+
+class _Holder:
+    """Holds the only inference slot until released."""
+
+    def __init__(self, scheduler, priority=INTERACTIVE):
+        self.release = threading.Event()
+        self._held = threading.Event()
+
+        def hold():
+            with scheduler.step():
+                self._held.set()
+                self.release.wait()
+
+        self.thread = threading.Thread(target=scheduler.run_as, args=(priority, "holder", hold))
+        self.thread.start()
+        assert self._held.wait(5)
+
+    def finish(self):
+        self.release.set()
+        self.thread.join(5)
+
+
+def _queue_step(scheduler, priority, client, name, order):
+    """Start a one-step job and return once its step is waiting for the slot."""
+    before = _steps_waiting(scheduler)
+
+    def work():
+        with scheduler.step():
+            order.append(name)
+
+    thread = threading.Thread(target=scheduler.run_as, args=(priority, client, work))
+    thread.start()
+    _wait_until(lambda: _steps_waiting(scheduler) == before + 1)
+    return thread
+
+
+def test_higher_priority_steps_go_first():
+    scheduler = _scheduler()
+    order = []
+    holder = _Holder(scheduler)
+    threads = [
+        _queue_step(scheduler, BATCH, "a", "batch", order),
+        _queue_step(scheduler, MEDIA, "a", "media", order),
+        _queue_step(scheduler, INTERACTIVE, "a", "text", order),
+    ]
+    holder.finish()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["text", "media", "batch"]
+
+
+def test_interactive_step_preempts_media_job_between_chunks():
+    scheduler = _scheduler()
+    order = []
+    in_first_chunk = threading.Event()
+    finish_first_chunk = threading.Event()
+
+    def media_job():
+        for chunk in range(3):
+            with scheduler.step():
+                order.append(f"media-{chunk}")
+                if chunk == 0:
+                    in_first_chunk.set()
+                    finish_first_chunk.wait(5)
+
+    media = threading.Thread(target=scheduler.run_as, args=(MEDIA, "upload", media_job))
+    media.start()
+    assert in_first_chunk.wait(5)
+    text = _queue_step(scheduler, INTERACTIVE, "paste", "text", order)
+    finish_first_chunk.set()
+    media.join(5)
+    text.join(5)
+    assert order == ["media-0", "text", "media-1", "media-2"]
+
+
+def test_slots_are_shared_fairly_between_clients():
+    scheduler = _scheduler()
+    order = []
+    holder = _Holder(scheduler, priority=BATCH)
+    threads = [
+        _queue_step(scheduler, MEDIA, "alice", "alice-1", order),
+        _queue_step(scheduler, MEDIA, "alice", "alice-2", order),
+        _queue_step(scheduler, MEDIA, "bob", "bob-1", order),
+    ]
+    holder.finish()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["alice-1", "bob-1", "alice-2"]
+
+
+def test_waiting_steps_age_past_fresh_interactive_work():
+    scheduler = _scheduler(aging_seconds=0.05)
+    order = []
+    holder = _Holder(scheduler)
+    threads = [_queue_step(scheduler, BATCH, "offline", "batch", order)]
+    time.sleep(0.25)
+    threads.append(_queue_step(scheduler, INTERACTIVE, "paste", "text", order))
+    holder.finish()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["batch", "text"]
+
+
+def test_too_many_waiting_jobs_are_turned_away():
+    scheduler = InferenceScheduler(1, {INTERACTIVE: 1, MEDIA: 1, BATCH: 1}, aging_seconds=0, max_waiting_jobs=1)
+    release = threading.Event()
+    running = threading.Thread(target=scheduler.run_as, args=(MEDIA, "a", release.wait))
+    running.start()
+    _wait_until(lambda: scheduler.stats()["media"]["jobs_running"] == 1)
+    waiting = threading.Thread(target=scheduler.run_as, args=(MEDIA, "b", lambda: None))
+    waiting.start()
+    _wait_until(lambda: scheduler.stats()["media"]["jobs_waiting"] == 1)
+
+    try:
+        with pytest.raises(SchedulerBusy) as excinfo:
+            with scheduler.job(MEDIA, "c"):
+                pass
+        assert excinfo.value.retry_after > 0
+        # A class with a free job slot is not affected.
+        with scheduler.job(INTERACTIVE, "d"):
+            pass
+    finally:
+        release.set()
+        running.join(5)
+        waiting.join(5)
+    assert scheduler.stats()["media"] == {
+        "jobs_running": 0, "jobs_waiting": 0, "job_limit": 1, "steps_running": 0, "steps_waiting": 0,
+    }
@@ -0,0 +1,66 @@
+import pytest
+
+from backend.services.search_index import SearchIndex
+from backend.services.transcriber import TimedTranscript
+
+
+def _transcript(media_hash, *texts, seconds=3.0):
+    segments = [(i * seconds, (i + 1) * seconds, text) for i, text in enumerate(texts)]
+    return TimedTranscript.from_windows([segments], 0.0, media_hash=media_hash, duration=len(texts) * seconds)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SearchIndex(tmp_path / "search.sqlite3")
+
+
+def test_segments_are_found_with_their_timestamps(index):
+    lecture_id = index.add_lecture(
+        _transcript("a", "welcome to the course", "today gradient descent", "see you next week"), "Lecture 1"
+    )
+    [result] = index.search("gradient")
+    assert result["lecture_id"] == lecture_id
+    assert result["title"] == "Lecture 1"
+    assert result["duration"] == 9.0
+    assert result["matches"] == [{"start": 3.0, "end": 6.0, "snippet": "today [gradient] descent"}]
+
+
+def test_reindexing_the_same_media_replaces_it(index):
+    first = index.add_lecture(_transcript("a", "gradient descent basics"), "Draft")
+    second = index.add_lecture(_transcript("a", "gradient descent revisited", "with momentum"), "Final")
+    assert first == second
+
+    [result] = index.search("gradient")
+    assert result["title"] == "Final"
+    assert [m["snippet"] for m in result["matches"]] == ["[gradient] descent revisited"]
+    assert index.search("basics") == []
+    assert len(index.search("momentum")) == 1
+
+
+def test_every_term_must_appear_somewhere_in_the_lecture(index):
+    # The terms never share a segment, but both are in the lecture.
+    both = index.add_lecture(
+        _transcript("a", "first we define the loss", "filler", "then we minimise it with gradient steps"), "Both"
+    )
+    index.add_lecture(_transcript("b", "the loss of a chess piece"), "Loss only")
+
+    results = index.search("loss gradient")
+    assert [r["lecture_id"] for r in results] == [both]
+    # Snippets for either term, in time order.
+    assert [m["start"] for m in results[0]["matches"]] == [0.0, 6.0]
+
+
+def test_results_and_snippets_are_limited(index):
+    for n in range(3):
+        index.add_lecture(_transcript(f"m{n}", *["matrix multiplication"] * 8), f"Lecture {n}")
+    results = index.search("matrix", limit=2, matches_per_lecture=3)
+    assert len(results) == 2
+    assert all(len(r["matches"]) == 3 for r in results)
+    assert all(r["matches"] == sorted(r["matches"], key=lambda m: m["start"]) for r in results)
+
+
+@pytest.mark.parametrize("query", ['"', "loss OR", "NEAR(loss", "lecture_id:1", "*", "-loss", ""])
+def test_query_syntax_cannot_be_injected(index, query):
+    index.add_lecture(_transcript("a", "the loss function"), "Lecture")
+    assert isinstance(index.search(query), list)
+
@@ -0,0 +1,87 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from backend.services import segmentation
+
+TOPICS = [
+    "gradient descent learning rate loss function weights optimizer momentum convergence",
+    "photosynthesis chlorophyll sunlight glucose plants leaves carbon dioxide oxygen",
+    "medieval castles knights kingdoms feudal lords peasants battles siege armies",
+    "volcanoes magma tectonic plates eruptions lava earthquakes crust mantle",
+]
+
+
+def _lecture(words_per_topic, topics=TOPICS, sentence_words=12, seed=0):
+    rng = random.Random(seed)
+    sentences = []
+    for topic in topics:
+        vocab = topic.split()
+        for _ in range(words_per_topic // sentence_words):
+            words = [rng.choice(vocab) for _ in range(sentence_words)]
+            sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def _reference_depth(similarity):
+    depths = []
+    for i in range(len(similarity)):
+        left = i
+        while left > 0 and similarity[left - 1] >= similarity[left]:
+            left -= 1
+        right = i
+        while right < len(similarity) - 1 and similarity[right + 1] >= similarity[right]:
+            right += 1
+        depths.append((similarity[left] - similarity[i]) + (similarity[right] - similarity[i]))
+    return np.array(depths)
+
+
+def test_depth_scores_match_the_textbook_definition():
+    rng = np.random.default_rng(0)
+    for size in (0, 1, 2, 7, 200):
+        similarity = rng.random(size)
+        similarity[::5] = similarity[:1].sum()  # plateaus
+        np.testing.assert_allclose(segmentation._depth_scores(similarity), _reference_depth(similarity))
+
+
+@pytest.mark.parametrize("words", [1289, 2000, 6000])
+def test_no_more_chapters_than_fixed_chunking(words):
+    chapters = segmentation.segment(_lecture(words // 4 + 12), max_words=900)
+    total = sum(c.word_count for c in chapters)
+    assert len(chapters) <= math.ceil(total / 900)
+    assert all(c.word_count <= 900 for c in chapters)
+
+
+def test_chapters_follow_topic_shifts():
+    # Three 396-word topics: either topic boundary gives two chapters under 900 words.
+    text = _lecture(400, topics=TOPICS[:3])
+    chapters = segmentation.segment(text, max_words=900)
+    assert len(chapters) == 2
+    assert chapters[1].start_sentence in (33, 66)
+    assert " ".join(c.text for c in chapters) == " ".join(segmentation.split_sentences(text))
+
+
+def test_run_on_transcript_is_split_under_the_limit():
+    rng = random.Random(1)
+    text = " ".join(rng.choice(TOPICS[0].split()) for _ in range(2600))  # no punctuation at all
+    chapters = segmentation.segment(text, max_words=900)
+    assert sum(c.word_count for c in chapters) == 2600
+    assert len(chapters) == 3
+    assert all(c.word_count <= 900 for c in chapters)
+
+
+def test_long_sentences_are_cut_inside_punctuated_text():
+    text = "Short opening sentence. " + " ".join(["word"] * 450) + ". Closing remark."
+    sentences = segmentation.split_sentences(text)
+    assert max(len(s.split()) for s in sentences) <= 200
+    assert sum(len(s.split()) for s in sentences) == 455
+
+
+def test_short_text_is_one_chapter():
+    chapters = segmentation.segment("Just a couple of sentences. Nothing else here.")
+    assert len(chapters) == 1
+    assert chapters[0].start_sentence == 0
+    assert chapters[0].word_count == 8
+    assert segmentation.segment("   ") == []
@@ -0,0 +1,106 @@
+import gzip
+import re
+
+import pytest
+from starlette.requests import Request
+
+from backend.services import static_assets
+from backend.services.static_assets import IMMUTABLE, REVALIDATE, StaticAssets
+
+SCRIPT = "console.log('lecture summarizer');\n" * 40
+
+
+def _request(**headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    # Keep the negotiation deterministic whether or not brotli is installed.
+    monkeypatch.setattr(static_assets, "brotli", None)
+    (tmp_path / "app.js").write_text(SCRIPT)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG" + b"\0" * 600)
+    (tmp_path / "index.html").write_text('<script src="app.js"></script><img src="./logo.png">')
+    assets = StaticAssets(tmp_path)
+    assets.load()
+    return assets
+
+
+def test_gzip_is_served_only_when_accepted(assets):
+    compressed = assets.response("app.js", _request(accept_encoding="gzip, deflate"))
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(compressed.body).decode() == SCRIPT
+
+    for header in ("", "deflate", "gzip;q=0"):
+        plain = assets.response("app.js", _request(accept_encoding=header))
+        assert "content-encoding" not in plain.headers
+        assert plain.body.decode() == SCRIPT
+
+    assert assets.response("app.js", _request(accept_encoding="*")).headers["content-encoding"] == "gzip"
+
+
+def test_binary_assets_are_not_compressed(assets):
+    response = assets.response("logo.png", _request(accept_encoding="gzip"))
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_etags_differ_per_encoding_and_revalidate(assets):
+    plain = assets.response("app.js", _request())
+    compressed = assets.response("app.js", _request(accept_encoding="gzip"))
+    assert plain.headers["etag"] != compressed.headers["etag"]
+
+    not_modified = assets.response(
+        "app.js", _request(accept_encoding="gzip", if_none_match=compressed.headers["etag"])
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert not_modified.headers["etag"] == compressed.headers["etag"]
+
+    weak = assets.response("app.js", _request(if_none_match=f'"other", W/{plain.headers["etag"]}'))
+    assert weak.status_code == 304
+    # The gzip ETag does not validate the identity body.
+    assert assets.response("app.js", _request(if_none_match=compressed.headers["etag"])).status_code == 200
+
+
+def test_fingerprinted_aliases_are_immutable_and_referenced_from_html(assets):
+    assert assets.response("app.js", _request()).headers["cache-control"] == REVALIDATE
+    index = assets.response("index.html", _request())
+    assert index.headers["cache-control"] == REVALIDATE
+
+    html = index.body.decode()
+    script = re.search(r'src="(app\.[0-9a-f]{10}\.js)"', html).group(1)
+    assert re.search(r'src="\./logo\.[0-9a-f]{10}\.png"', html)
+
+    alias = assets.response(script, _request())
+    assert alias.headers["cache-control"] == IMMUTABLE
+    assert alias.body.decode() == SCRIPT
+
+
+def test_unknown_paths_fall_back_to_index(assets, tmp_path):
+    assert assets.response("/lectures/42", _request()).body == assets.response("index.html", _request()).body
+
+    (tmp_path / "empty").mkdir()
+    empty = StaticAssets(tmp_path / "empty")
+    empty.load()
+    assert empty.response("anything", _request()) is None
+
+
+def test_brotli_is_preferred_when_installed(tmp_path):
+    brotli = pytest.importorskip("brotli")
+    (tmp_path / "app.js").write_text(SCRIPT)
+    assets = StaticAssets(tmp_path)
+    assets.load()
+
+    response = assets.response("app.js", _request(accept_encoding="gzip, br"))
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(response.body).decode() == SCRIPT
+    gzipped = assets.response("app.js", _request(accept_encoding="gzip"))
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert len({response.headers["etag"], gzipped.headers["etag"]}) == 2
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from backend.config import TARGET_SAMPLE_RATE
+from backend.services import transcriber
+
+
+@pytest.fixture
+def media(tmp_path, monkeypatch):
+    """A non-wav upload whose 'conversion' writes one second of silence."""
+    source = tmp_path / "lecture.mp3"
+    source.write_bytes(b"not really an mp3")
+    converted = tmp_path / "converted.wav"
+
+    def fake_ensure_wav(path):
+        sf.write(converted, np.zeros(TARGET_SAMPLE_RATE, dtype="float32"), TARGET_SAMPLE_RATE)
+        return converted
+
+    monkeypatch.setattr(transcriber, "_ensure_wav", fake_ensure_wav)
+    return source, converted
+
+
+def test_failed_transcription_removes_converted_wav_and_source(media, monkeypatch):
+    source, converted = media
+
+    def fail(chunks, sample_rate):
+        raise ValueError("decoder crashed")
+
+    monkeypatch.setattr(transcriber, "_transcribe_batch", fail)
+
+    with pytest.raises(ValueError):
+        transcriber.transcribe_media_timed(source)
+
+    assert not converted.exists()
+    assert not source.exists()
+
+
+def test_failed_transcription_keeps_source_when_asked(media, monkeypatch):
+    source, converted = media
+    monkeypatch.setattr(transcriber, "_transcribe_batch", lambda chunks, rate: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        transcriber.transcribe_media_timed(source, delete_source=False)
+
+    assert not converted.exists()
+    assert source.exists()
+
+
+def test_checkpoints_resume_and_clear(media, monkeypatch):
+    source, _ = media
+    calls = []
+
+    def fake_batch(chunks, sample_rate):
+        calls.append(len(chunks))
+        return [[(0.0, 1.0, "hello there")] for _ in chunks]
+
+    monkeypatch.setattr(transcriber, "_transcribe_batch", fake_batch)
+
+    transcript = transcriber.transcribe_media_timed(source, delete_source=False)
+    assert transcript.text == "hello there"
+    assert list(transcript.segments()) == [(0.0, 1.0, "hello there")]
+
+    # Same content again: every window comes from the checkpoint.
+    transcriber.transcribe_media_timed(source, delete_source=False)
+    assert len(calls) == 1
+
+    transcriber.clear_checkpoints(transcript)
+    transcriber.transcribe_media_timed(source, delete_source=False)
+    assert len(calls) == 2
@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from backend.config import UPLOAD_PART_SIZE
+from backend.services import uploads
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", tmp_path / "uploads")
+    return tmp_path / "uploads"
+
+
+async def _body(data, piece=7):
+    for i in range(0, len(data), piece):
+        yield data[i : i + piece]
+
+
+def _put(upload_id, offset, data, checksum=None):
+    checksum = checksum or hashlib.sha256(data).hexdigest()
+    return asyncio.run(uploads.write_part(upload_id, offset, _body(data), checksum))
+
+
+def test_merged_ranges_join_overlapping_and_adjacent_parts():
+    parts = {
+        "0": {"length": 10},
+        "10": {"length": 5},   # adjacent
+        "12": {"length": 10},  # overlapping
+        "40": {"length": 5},   # gap before it
+    }
+    assert uploads._merged_ranges(parts) == [(0, 22), (40, 45)]
+    assert uploads._merged_ranges({}) == []
+
+
+def test_parts_in_any_order_assemble_the_file():
+    data = bytes(range(256)) * 4
+    session = uploads.create_session("talk.mp3", len(data))
+    upload_id = session["upload_id"]
+
+    _put(upload_id, 512, data[512:])
+    _put(upload_id, 0, data[:512])
+
+    path = uploads.complete_session(upload_id)
+    assert path.suffix == ".mp3"
+    assert path.read_bytes() == data
+    with pytest.raises(uploads.UploadNotFoundError):
+        uploads.get_status(upload_id)
+
+
+def test_status_reports_progress_for_resume():
+    data = b"x" * 300
+    upload_id = uploads.create_session("talk.wav", len(data))["upload_id"]
+    _put(upload_id, 0, data[:100])
+    _put(upload_id, 200, data[200:])
+
+    status = uploads.get_status(upload_id)
+    assert status["received_bytes"] == 200
+    assert status["parts"] == [0, 200]
+    assert status["filename"] == "talk.wav"
+
+    with pytest.raises(RuntimeError, match="received 200 of 300"):
+        uploads.assembled_path(upload_id)
+
+    # Resuming: only the missing part is sent.
+    _put(upload_id, 100, data[100:200])
+    assert uploads.get_status(upload_id)["received_bytes"] == 300
+
+
+def test_bad_checksum_is_not_recorded():
+    upload_id = uploads.create_session("a.wav", 10)["upload_id"]
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        _put(upload_id, 0, b"0123456789", checksum="0" * 64)
+    assert uploads.get_status(upload_id)["received_bytes"] == 0
+
+
+def test_bad_retry_of_a_received_part_keeps_the_good_bytes(upload_dir):
+    data = b"A" * 100
+    upload_id = uploads.create_session("a.wav", len(data))["upload_id"]
+    _put(upload_id, 0, data)
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        _put(upload_id, 0, b"B" * 100, checksum=hashlib.sha256(data).hexdigest())
+
+    assert uploads.assembled_path(upload_id).read_bytes() == data
+    assert not list((upload_dir / upload_id).glob("*.tmp"))
+
+
+def test_part_limits_are_enforced():
+    upload_id = uploads.create_session("a.wav", 10)["upload_id"]
+    with pytest.raises(RuntimeError, match="outside the upload"):
+        _put(upload_id, 10, b"x")
+    with pytest.raises(RuntimeError, match="declared upload size"):
+        _put(upload_id, 5, b"x" * 6)
+    with pytest.raises(RuntimeError):
+        uploads.create_session("a.wav", 0)
+
+
+def test_part_size_limit():
+    size = UPLOAD_PART_SIZE + 1
+    upload_id = uploads.create_session("big.wav", size)["upload_id"]
+    with pytest.raises(RuntimeError, match="part size"):
+        _put(upload_id, 0, b"x" * size)
+
+
+def test_assembled_file_survives_until_claimed():
+    data = b"lecture audio"
+    upload_id = uploads.create_session("talk.m4a", len(data))["upload_id"]
+    _put(upload_id, 0, data)
+
+    # Probing/retrying keeps the session; it can be asked for repeatedly.
+    first = uploads.assembled_path(upload_id)
+    assert uploads.assembled_path(upload_id) == first
+    assert first.read_bytes() == data
+    with pytest.raises(RuntimeError, match="already complete"):
+        _put(upload_id, 0, data)
+
+    claimed = uploads.complete_session(upload_id)
+    assert claimed.read_bytes() == data
+    with pytest.raises(uploads.UploadNotFoundError):
+        uploads.complete_session(upload_id)
+
+
+def test_unknown_or_malformed_ids_are_not_found():
+    with pytest.raises(uploads.UploadNotFoundError):
+        uploads.get_status("../../etc")
+    with pytest.raises(uploads.UploadNotFoundError):
+        uploads.get_status("0" * 32)